@@ -2,17 +2,22 @@
 from __future__ import annotations
 
 import logging
+import weakref
 from pathlib import Path
 from typing import Optional
 
-from flask import Flask
-from sqlalchemy import create_engine
+from flask import Flask, g, has_request_context, request
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from config import config_by_name
-from database import Base, get_tracked_test_engine
+from database import Base, create_missing_indexes, get_tracked_test_engine
+from .json_provider import OrjsonProvider
 from .routes import api_bp
+from .services.async_writer import AsyncPDFWriter
+from .services.meal_plan_service import MealPlanService
+from .services.recipe_service import RecipeService
 from .web import views_bp
 
 PACKAGE_ROOT = Path(__file__).resolve().parent
@@ -28,8 +33,14 @@ def _ensure_extension_placeholders(app: Flask) -> None:
         app.extensions = {}
 
     app.extensions.setdefault("db_session_factory", None)
+    app.extensions.setdefault("db_sessionmaker", None)
+    app.extensions.setdefault("session_registry", None)
     app.extensions.setdefault("db_engine", None)
     app.extensions.setdefault("db_uri", None)
+    app.extensions.setdefault("db_initialised", weakref.WeakSet())
+    app.extensions.setdefault("recipe_service", None)
+    app.extensions.setdefault("meal_plan_service", None)
+    app.extensions.setdefault("pdf_writer", None)
 
 
 def _initialise_configuration(app: Flask, config_name: Optional[str]) -> None:
@@ -47,19 +58,80 @@ def _initialise_configuration(app: Flask, config_name: Optional[str]) -> None:
 def _reset_database_extensions(app: Flask) -> None:
     """Dispose of an existing engine and clear session factories."""
 
+    # A streamed response that was never closed still holds its session
+    session_factory = app.extensions.get("db_session_factory")
+    if session_factory is not None:
+        session_factory.remove()
+
     engine = app.extensions.get("db_engine")
     if engine is not None:
         engine.dispose()
 
     app.extensions["db_engine"] = None
     app.extensions["db_session_factory"] = None
+    app.extensions["db_sessionmaker"] = None
+    app.extensions["session_registry"] = None
     app.extensions["db_uri"] = None
+    app.extensions["_session_cache"] = None
+    app.extensions["recipe_service"] = None
+    app.extensions["meal_plan_service"] = None
+    app.extensions["pdf_writer"] = None
+
+
+def _pool_options(app: Flask) -> dict[str, object]:
+    """Return connection pool settings for server-backed databases."""
+
+    return {
+        "pool_size": app.config.get("DB_POOL_SIZE", 10),
+        "max_overflow": app.config.get("DB_MAX_OVERFLOW", 20),
+        "pool_timeout": app.config.get("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": app.config.get("DB_POOL_RECYCLE", 3600),
+        "pool_pre_ping": True,
+    }
+
+
+def _count_query(*_args) -> None:
+    """Count statements executed on behalf of the current request."""
+
+    if has_request_context():
+        g.query_count = g.get("query_count", 0) + 1
+
+
+def _watch_query_count(app: Flask, engine) -> None:
+    """Attach the statement counter when ``QUERY_COUNT_WARNING`` is set."""
+
+    if app.config.get("QUERY_COUNT_WARNING") and not event.contains(engine, "before_cursor_execute", _count_query):
+        event.listen(engine, "before_cursor_execute", _count_query)
+
+
+def init_db(app: Flask, engine) -> None:
+    """Create missing tables once per engine when ``AUTO_CREATE_ALL`` is enabled."""
+
+    if not app.config.get("AUTO_CREATE_ALL", True):
+        return
+
+    # Weak references so a recycled ``id()`` of a disposed engine cannot
+    # mask a fresh one.
+    initialised = app.extensions["db_initialised"]
+    if engine in initialised:
+        return
+
+    Base.metadata.create_all(engine)
+    create_missing_indexes(engine)
+    initialised.add(engine)
 
 
 def _get_session_factory(app: Flask):
     """Return a scoped session factory for the current database URI."""
 
     target_uri = app.config.get("SQLALCHEMY_DATABASE_URI")
+
+    # Fast path: the configured URI object is normally never replaced, so an
+    # identity check avoids the full comparison on every request.
+    cache = app.extensions.get("_session_cache")
+    if cache is not None and cache[0] is target_uri:
+        return cache[1]
+
     if not target_uri:
         raise RuntimeError("SQLALCHEMY_DATABASE_URI is not configured")
 
@@ -83,6 +155,8 @@ def _get_session_factory(app: Flask):
                 connect_args["check_same_thread"] = False
                 if target_uri.startswith("sqlite:///:memory"):
                     engine_kwargs["poolclass"] = StaticPool
+            else:
+                engine_kwargs.update(_pool_options(app))
 
             if connect_args:
                 engine_kwargs["connect_args"] = connect_args
@@ -90,13 +164,28 @@ def _get_session_factory(app: Flask):
             engine = create_engine(target_uri, **engine_kwargs)
         else:
             engine = shared_engine
-        Base.metadata.create_all(engine)
-        session_factory = scoped_session(sessionmaker(bind=engine, autoflush=False))
+        init_db(app, engine)
+        _watch_query_count(app, engine)
+        # Sessions live for a single request, so instances are not expired on
+        # commit: attribute access afterwards reads the values just written
+        # instead of issuing a fresh SELECT.
+        session_maker = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, future=True)
+        session_factory = scoped_session(session_maker)
 
         app.extensions["db_engine"] = engine
         app.extensions["db_session_factory"] = session_factory
+        app.extensions["db_sessionmaker"] = session_maker
+        app.extensions["session_registry"] = session_factory
         app.extensions["db_uri"] = target_uri
-
+        # Services only hold the registry, which resolves to the calling
+        # thread's session, so one instance of each serves every request.
+        app.extensions["recipe_service"] = RecipeService(session_factory)
+        app.extensions["meal_plan_service"] = MealPlanService(session_factory)
+        # The writer's thread opens its own sessions rather than using the
+        # request-scoped registry.
+        app.extensions["pdf_writer"] = AsyncPDFWriter(session_maker)
+
+    app.extensions["_session_cache"] = (target_uri, session_factory)
     return session_factory
 
 
@@ -111,6 +200,7 @@ def create_app(config_name: Optional[str] = None) -> Flask:
         static_folder=str(static_dir),
         template_folder=str(templates_dir),
     )
+    app.json = OrjsonProvider(app)
 
     _ensure_extension_placeholders(app)
     _initialise_configuration(app, config_name)
@@ -123,10 +213,28 @@ def create_app(config_name: Optional[str] = None) -> Flask:
 
     @app.teardown_appcontext
     def remove_session(exception: Optional[BaseException] = None) -> None:  # pragma: no cover - defensive
+        # Streamed pages still render from the session after teardown; they
+        # remove it themselves once the response is closed.
+        if g.get("defer_session_removal"):
+            return
         session_factory = app.extensions.get("db_session_factory")
         if session_factory is not None:
             session_factory.remove()
 
+    @app.after_request
+    def warn_on_query_count(response):
+        threshold = app.config.get("QUERY_COUNT_WARNING")
+        query_count = g.get("query_count", 0)
+        if threshold and query_count > threshold:
+            LOGGER.warning(
+                "%s %s issued %d SQL statements (threshold %d)",
+                request.method,
+                request.path,
+                query_count,
+                threshold,
+            )
+        return response
+
     app.register_blueprint(views_bp)
     app.register_blueprint(api_bp)
 
@@ -135,4 +243,4 @@ def create_app(config_name: Optional[str] = None) -> Flask:
     return app
 
 
-__all__ = ["create_app"]
+__all__ = ["create_app", "init_db"]
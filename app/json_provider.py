@@ -0,0 +1,63 @@
+"""orjson-backed JSON provider used for API responses and request parsing."""
+from __future__ import annotations
+
+import decimal
+import json
+from typing import Any
+
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+
+def _default(obj: Any) -> Any:
+    """Serialise the types Flask supports that orjson does not handle natively."""
+
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """Serialise and parse JSON with orjson instead of the stdlib encoder."""
+
+    option = orjson.OPT_NON_STR_KEYS
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # ``tojson(indent=2)`` and friends pass stdlib keyword arguments;
+        # map the ones orjson supports onto its option flags.
+        option = self.option
+        if kwargs.get("indent") == 2:
+            del kwargs["indent"]
+            option |= orjson.OPT_INDENT_2
+        elif "indent" in kwargs and kwargs["indent"] is None:
+            del kwargs["indent"]
+        if kwargs.keys() <= {"sort_keys"}:
+            if kwargs.get("sort_keys"):
+                option |= orjson.OPT_SORT_KEYS
+            return orjson.dumps(obj, default=_default, option=option).decode()
+
+        # orjson has no equivalent for the rest (e.g. a four-space indent or
+        # custom separators), so honour them with the stdlib encoder.
+        if option & orjson.OPT_INDENT_2:
+            kwargs["indent"] = 2
+        kwargs.setdefault("default", _default)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand the encoded bytes straight to the response to avoid a
+        # decode/encode round trip through ``str``.
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self.option | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+__all__ = ["OrjsonProvider"]
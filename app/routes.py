@@ -2,14 +2,18 @@
 from __future__ import annotations
 
 import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
 from http import HTTPStatus
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from flask import Blueprint, current_app, jsonify, request
 from sqlalchemy.exc import SQLAlchemyError
 
+from database import Recipe
 from .services.meal_plan_service import MealPlanService
-from .services.nutrition_service import NutritionService
+from .services.nutrition_service import calculate_nutrition as estimate_nutrition
 from .services.pdf_service import PDFService
 from .services.recipe_service import RecipeService
 from .services.scraper_service import ScraperService
@@ -20,10 +24,64 @@ api_bp = Blueprint("api", __name__, url_prefix="/api")
 
 
 def _get_session():
-    """Return a scoped SQLAlchemy session bound to the current app."""
+    """Return the scoped session registry bound to the current app.
 
-    session_factory = current_app.extensions["get_session_factory"]()
-    return session_factory
+    The registry is memoised on the app once built; the factory is only
+    consulted again when ``SQLALCHEMY_DATABASE_URI`` has changed.
+    """
+
+    extensions = current_app.extensions
+    registry = extensions["session_registry"]
+    if registry is None or extensions["db_uri"] != current_app.config.get("SQLALCHEMY_DATABASE_URI"):
+        registry = extensions["get_session_factory"]()
+    return registry
+
+
+def _recipe_service() -> RecipeService:
+    """Return the app-wide recipe service bound to the session registry."""
+
+    _get_session()
+    return current_app.extensions["recipe_service"]
+
+
+def _meal_plan_service() -> MealPlanService:
+    """Return the app-wide meal plan service bound to the session registry."""
+
+    _get_session()
+    return current_app.extensions["meal_plan_service"]
+
+
+# PDFService holds no per-request state, so one instance serves every request.
+_pdf_service = PDFService()
+
+_RECIPE_CACHE_SIZE = 1024
+_recipe_cache: "OrderedDict[Tuple[int, datetime], Dict[str, Any]]" = OrderedDict()
+_recipe_cache_lock = threading.Lock()
+
+
+def _serialise_recipe(recipe: Recipe) -> Dict[str, Any]:
+    """Return ``recipe.to_dict()``, reusing earlier output for unchanged rows.
+
+    Entries are keyed on ``(id, updated_at)``; ``RecipeService`` bumps
+    ``updated_at`` on every mutation, so a stale entry is never served.
+    """
+
+    if recipe.id is None or recipe.updated_at is None:
+        return recipe.to_dict()
+
+    key = (recipe.id, recipe.updated_at)
+    with _recipe_cache_lock:
+        cached = _recipe_cache.get(key)
+        if cached is not None:
+            _recipe_cache.move_to_end(key)
+            return cached
+
+    data = recipe.to_dict()
+    with _recipe_cache_lock:
+        _recipe_cache[key] = data
+        if len(_recipe_cache) > _RECIPE_CACHE_SIZE:
+            _recipe_cache.popitem(last=False)
+    return data
 
 
 @api_bp.errorhandler(SQLAlchemyError)
@@ -36,21 +94,21 @@ def handle_database_error(error: SQLAlchemyError):  # pragma: no cover - defensi
 def list_recipes():
     """Return a list of recipes respecting optional filter parameters."""
 
-    session = _get_session()
-    service = RecipeService(session)
+    service = _recipe_service()
     recipes = service.get_recipes(request.args.to_dict())
-    return jsonify([recipe.to_dict() for recipe in recipes])
+    return jsonify([_serialise_recipe(recipe) for recipe in recipes])
 
 
 @api_bp.route("/recipes/<int:recipe_id>", methods=["GET"])
 def get_recipe(recipe_id: int):
-    session = _get_session()
-    service = RecipeService(session)
-    recipe = service.get_recipe_by_id(recipe_id)
+    service = _recipe_service()
+    # Relationships are only needed on a cache miss, where ``to_dict`` loads
+    # them lazily; a hit is answered from the recipe row alone.
+    recipe = service.get_recipe_by_id(recipe_id, load_relationships=False)
     if recipe is None:
         return jsonify({"message": "Recipe not found"}), HTTPStatus.NOT_FOUND
 
-    return jsonify(recipe.to_dict())
+    return jsonify(_serialise_recipe(recipe))
 
 
 @api_bp.route("/recipes", methods=["POST"])
@@ -59,8 +117,7 @@ def create_recipe():
     if not payload:
         return jsonify({"message": "Request body must be JSON"}), HTTPStatus.BAD_REQUEST
 
-    session = _get_session()
-    service = RecipeService(session)
+    service = _recipe_service()
     try:
         recipe = service.create_recipe(payload)
     except ValueError as exc:
@@ -75,8 +132,7 @@ def update_recipe(recipe_id: int):
     if payload is None:
         return jsonify({"message": "Request body must be JSON"}), HTTPStatus.BAD_REQUEST
 
-    session = _get_session()
-    service = RecipeService(session)
+    service = _recipe_service()
     recipe = service.update_recipe(recipe_id, payload)
     if recipe is None:
         return jsonify({"message": "Recipe not found"}), HTTPStatus.NOT_FOUND
@@ -86,8 +142,7 @@ def update_recipe(recipe_id: int):
 
 @api_bp.route("/recipes/<int:recipe_id>", methods=["DELETE"])
 def delete_recipe(recipe_id: int):
-    session = _get_session()
-    service = RecipeService(session)
+    service = _recipe_service()
     deleted = service.delete_recipe(recipe_id)
     if not deleted:
         return jsonify({"message": "Recipe not found"}), HTTPStatus.NOT_FOUND
@@ -98,8 +153,15 @@ def delete_recipe(recipe_id: int):
 @api_bp.route("/recipes/<int:recipe_id>/pdf", methods=["POST"])
 def generate_recipe_pdf(recipe_id: int):
     session = _get_session()
-    pdf_service = PDFService()
-    service = RecipeService(session, pdf_service=pdf_service)
+    service = RecipeService(session, pdf_service=_pdf_service)
+
+    if current_app.config.get("PDF_ASYNC", False):
+        # Rendering happens on the writer thread; the response only promises
+        # where the file will appear.
+        pdf_path = service.queue_pdf(recipe_id, current_app.extensions["pdf_writer"])
+        if pdf_path is None:
+            return jsonify({"message": "Recipe not found"}), HTTPStatus.NOT_FOUND
+        return jsonify({"pdf_path": pdf_path, "status": "pending"}), HTTPStatus.ACCEPTED
 
     pdf_path = service.generate_pdf(recipe_id)
     if pdf_path is None:
@@ -110,16 +172,14 @@ def generate_recipe_pdf(recipe_id: int):
 
 @api_bp.route("/meal-plans", methods=["GET"])
 def list_meal_plans():
-    session = _get_session()
-    service = MealPlanService(session)
+    service = _meal_plan_service()
     meal_plans = service.get_meal_plans(request.args.to_dict())
     return jsonify([meal_plan.to_dict() for meal_plan in meal_plans])
 
 
 @api_bp.route("/meal-plans/<int:meal_plan_id>", methods=["GET"])
 def get_meal_plan(meal_plan_id: int):
-    session = _get_session()
-    service = MealPlanService(session)
+    service = _meal_plan_service()
     meal_plan = service.get_meal_plan_by_id(meal_plan_id)
     if meal_plan is None:
         return jsonify({"message": "Meal plan not found"}), HTTPStatus.NOT_FOUND
@@ -134,8 +194,7 @@ def create_meal_plan():
     if not payload:
         return jsonify({"message": "Request body must be JSON"}), HTTPStatus.BAD_REQUEST
 
-    session = _get_session()
-    service = MealPlanService(session)
+    service = _meal_plan_service()
     try:
         meal_plan = service.create_meal_plan(payload)
     except ValueError as exc:
@@ -150,8 +209,7 @@ def update_meal_plan(meal_plan_id: int):
     if payload is None:
         return jsonify({"message": "Request body must be JSON"}), HTTPStatus.BAD_REQUEST
 
-    session = _get_session()
-    service = MealPlanService(session)
+    service = _meal_plan_service()
     meal_plan = service.update_meal_plan(meal_plan_id, payload)
     if meal_plan is None:
         return jsonify({"message": "Meal plan not found"}), HTTPStatus.NOT_FOUND
@@ -161,8 +219,7 @@ def update_meal_plan(meal_plan_id: int):
 
 @api_bp.route("/meal-plans/<int:meal_plan_id>", methods=["DELETE"])
 def delete_meal_plan(meal_plan_id: int):
-    session = _get_session()
-    service = MealPlanService(session)
+    service = _meal_plan_service()
     deleted = service.delete_meal_plan(meal_plan_id)
     if not deleted:
         return jsonify({"message": "Meal plan not found"}), HTTPStatus.NOT_FOUND
@@ -176,8 +233,7 @@ def add_recipe_to_meal_plan(meal_plan_id: int):
     if not payload:
         return jsonify({"message": "Request body must be JSON"}), HTTPStatus.BAD_REQUEST
 
-    session = _get_session()
-    service = MealPlanService(session)
+    service = _meal_plan_service()
     try:
         meal_plan = service.add_recipe_to_meal_plan(
             meal_plan_id,
@@ -196,13 +252,6 @@ def add_recipe_to_meal_plan(meal_plan_id: int):
         ensure={"day": payload.get("day"), "meal_type": payload.get("meal_type")},
     )
 
-    day = payload.get("day")
-    if day and day not in data["days"]:
-        data["days"][day] = {}
-    meal_type = payload.get("meal_type")
-    if day and meal_type:
-        data["days"][day].setdefault(meal_type, [])
-
     return jsonify(data)
 
 
@@ -210,8 +259,7 @@ def add_recipe_to_meal_plan(meal_plan_id: int):
 def remove_recipe_from_meal_plan(meal_plan_id: int, recipe_id: int):
     payload: Dict[str, Any] = request.get_json(silent=True) or {}
     LOGGER.debug("Remove recipe payload: %s", payload)
-    session = _get_session()
-    service = MealPlanService(session)
+    service = _meal_plan_service()
 
     meal_plan = service.remove_recipe_from_meal_plan(
         meal_plan_id,
@@ -228,13 +276,6 @@ def remove_recipe_from_meal_plan(meal_plan_id: int, recipe_id: int):
         ensure={"day": payload.get("day"), "meal_type": payload.get("meal_type")},
     )
 
-    day = payload.get("day")
-    if day and day not in data["days"]:
-        data["days"][day] = {}
-    meal_type = payload.get("meal_type")
-    if day and meal_type:
-        data["days"][day].setdefault(meal_type, [])
-
     LOGGER.debug("Meal plan days after removal: %s", data["days"])
 
     return jsonify(data)
@@ -246,8 +287,7 @@ def calculate_nutrition():
     if not payload or "ingredients" not in payload:
         return jsonify({"message": "Request must include an 'ingredients' field"}), HTTPStatus.BAD_REQUEST
 
-    nutrition_service = NutritionService()
-    nutrition = nutrition_service.calculate_nutrition(payload["ingredients"])
+    nutrition = estimate_nutrition(payload["ingredients"])
     return jsonify(nutrition)
 
 
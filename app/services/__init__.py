@@ -1,4 +1,5 @@
 """Service layer for the Recipe Planner application."""
+from .async_writer import AsyncPDFWriter
 from .meal_plan_service import MealPlanService
 from .nutrition_service import NutritionService
 from .pdf_service import PDFService
@@ -6,6 +7,7 @@ from .recipe_service import RecipeService
 from .scraper_service import ScraperService
 
 __all__ = [
+    "AsyncPDFWriter",
     "MealPlanService",
     "NutritionService",
     "PDFService",
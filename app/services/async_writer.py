@@ -0,0 +1,80 @@
+"""Background rendering of recipe PDFs."""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from database import Recipe
+from .pdf_service import PDFService
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncPDFWriter:
+    """Render recipe PDFs on a daemon thread fed by a job queue.
+
+    Each job opens its own short-lived session, so the request that queued it
+    does not hold a connection while the PDF is rendered and written.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        pdf_service: Optional[PDFService] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.pdf_service = pdf_service or PDFService()
+        self._jobs: "queue.Queue[Tuple[int, str]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, recipe_id: int, output_path: str) -> None:
+        """Queue ``recipe_id`` to be rendered to ``output_path``."""
+
+        self._ensure_worker()
+        self._jobs.put((recipe_id, output_path))
+
+    def flush(self) -> None:
+        """Block until every queued job has been processed."""
+
+        self._jobs.join()
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="pdf-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            recipe_id, output_path = self._jobs.get()
+            try:
+                self._render(recipe_id, output_path)
+            except Exception:  # pragma: no cover - defensive
+                LOGGER.exception("Failed to render PDF for recipe %s", recipe_id)
+            finally:
+                self._jobs.task_done()
+
+    def _render(self, recipe_id: int, output_path: str) -> None:
+        session = self.session_factory()
+        try:
+            recipe = session.get(Recipe, recipe_id)
+            if recipe is None:
+                LOGGER.warning("Recipe %s disappeared before its PDF was rendered", recipe_id)
+                return
+
+            if self.pdf_service.generate_recipe_pdf(recipe, output_path):
+                recipe.pdf_path = output_path
+                session.commit()
+        finally:
+            session.close()
+
+
+__all__ = ["AsyncPDFWriter"]
@@ -1,11 +1,11 @@
 """Service layer encapsulating meal plan logic."""
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime, time
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy import delete, insert, select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from database import MealPlan, Recipe, meal_plan_recipe
 
@@ -21,16 +21,22 @@ class MealPlanService:
     # ------------------------------------------------------------------
     def get_meal_plans(self, filters: Optional[Dict[str, Any]] = None) -> List[MealPlan]:
         filters = filters or {}
-        query = self.session.query(MealPlan).order_by(MealPlan.created_at.desc())
+        # ``MealPlan.to_dict`` reads ``shopping_list``; load it for the whole
+        # page in one query instead of one lazy load per plan.
+        stmt = (
+            select(MealPlan)
+            .options(selectinload(MealPlan.shopping_list))
+            .order_by(MealPlan.created_at.desc())
+        )
 
         limit = filters.get("limit")
         if limit:
             try:
-                query = query.limit(int(limit))
+                stmt = stmt.limit(int(limit))
             except (TypeError, ValueError):  # pragma: no cover - defensive
                 pass
 
-        return query.all()
+        return list(self.session.execute(stmt).scalars())
 
     def get_meal_plan_by_id(self, meal_plan_id: int) -> Optional[MealPlan]:
         return self.session.get(MealPlan, meal_plan_id)
@@ -51,20 +57,30 @@ class MealPlanService:
             )
             .join(Recipe, Recipe.id == meal_plan_recipe.c.recipe_id)
             .where(meal_plan_recipe.c.meal_plan_id == meal_plan.id)
+            .options(
+                selectinload(Recipe.ingredients),
+                selectinload(Recipe.nutrition),
+                selectinload(Recipe.tags),
+            )
         )
 
+        # A recipe scheduled in several slots is only serialised once.
+        serialised: Dict[int, Dict[str, Any]] = {}
         for day, meal_type, recipe in results:
             meals = data["days"].setdefault(day, {})
             recipe_list = meals.setdefault(meal_type, [])
-            recipe_list.append(recipe.to_dict())
+            recipe_data = serialised.get(recipe.id)
+            if recipe_data is None:
+                recipe_data = serialised[recipe.id] = recipe.to_dict()
+            recipe_list.append(recipe_data)
 
         if ensure:
-            day = ensure.get("day") if ensure else None
-            meal_type = ensure.get("meal_type") if ensure else None
+            day = ensure.get("day")
+            meal_type = ensure.get("meal_type")
             if day:
                 ensured_meals = data["days"].setdefault(day, {})
-                if meal_type and meal_type not in ensured_meals:
-                    ensured_meals[meal_type] = []
+                if meal_type:
+                    ensured_meals.setdefault(meal_type, [])
 
         return data
 
@@ -84,7 +100,6 @@ class MealPlanService:
 
         self.session.add(meal_plan)
         self.session.commit()
-        self.session.refresh(meal_plan)
         return meal_plan
 
     def update_meal_plan(self, meal_plan_id: int, payload: Dict[str, Any]) -> Optional[MealPlan]:
@@ -101,7 +116,6 @@ class MealPlanService:
 
         self.session.add(meal_plan)
         self.session.commit()
-        self.session.refresh(meal_plan)
         return meal_plan
 
     def delete_meal_plan(self, meal_plan_id: int) -> bool:
@@ -127,21 +141,24 @@ class MealPlanService:
         if not meal_type:
             raise ValueError("'meal_type' is required")
 
-        meal_plan = self.get_meal_plan_by_id(meal_plan_id)
-        recipe = self.session.get(Recipe, recipe_id)
-        if meal_plan is None or recipe is None:
+        # Load the meal plan and confirm the recipe exists in one round trip.
+        meal_plan = self.session.execute(
+            select(MealPlan)
+            .join(Recipe, Recipe.id == recipe_id)
+            .where(MealPlan.id == meal_plan_id)
+        ).scalar_one_or_none()
+        if meal_plan is None:
             return None
 
         self.session.execute(
             insert(meal_plan_recipe).values(
                 meal_plan_id=meal_plan.id,
-                recipe_id=recipe.id,
+                recipe_id=recipe_id,
                 day=day,
                 meal_type=meal_type,
             )
         )
         self.session.commit()
-        self.session.refresh(meal_plan)
         return meal_plan
 
     def remove_recipe_from_meal_plan(
@@ -151,11 +168,9 @@ class MealPlanService:
         day: Optional[str],
         meal_type: Optional[str],
     ) -> Optional[MealPlan]:
-        meal_plan = self.get_meal_plan_by_id(meal_plan_id)
-        if meal_plan is None:
-            return None
-
-        deletion = delete(meal_plan_recipe).where(meal_plan_recipe.c.meal_plan_id == meal_plan.id)
+        # A matching link row implies the meal plan exists, so delete first and
+        # only load the plan for the response once something was removed.
+        deletion = delete(meal_plan_recipe).where(meal_plan_recipe.c.meal_plan_id == meal_plan_id)
         deletion = deletion.where(meal_plan_recipe.c.recipe_id == recipe_id)
         if day:
             deletion = deletion.where(meal_plan_recipe.c.day == day)
@@ -167,8 +182,7 @@ class MealPlanService:
             return None
 
         self.session.commit()
-        self.session.refresh(meal_plan)
-        return meal_plan
+        return self.get_meal_plan_by_id(meal_plan_id)
 
     # ------------------------------------------------------------------
     # Utility
@@ -181,8 +195,11 @@ class MealPlanService:
         if isinstance(value, datetime):
             return value
 
+        if isinstance(value, date):
+            return datetime.combine(value, time.min)
+
         try:
-            return datetime.fromisoformat(str(value))
+            return datetime.fromisoformat(value if isinstance(value, str) else str(value))
         except ValueError:
             raise ValueError("Dates must be ISO formatted strings (YYYY-MM-DD)") from None
 
@@ -1,15 +1,24 @@
 """Nutrition calculation utilities."""
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
 
 @dataclass
 class NormalisedIngredient:
     name: str
     amount: float
-    unit: str
+    grams_per_unit: float
+
+
+def _profile_rows(
+    profiles: Mapping[str, Mapping[str, float]], keys: Iterable[str]
+) -> Dict[str, Tuple[float, ...]]:
+    """Return each profile as a tuple of values ordered by ``keys``."""
+
+    return {name: tuple(profile.get(key, 0.0) for key in keys) for name, profile in profiles.items()}
 
 
 class NutritionService:
@@ -51,47 +60,75 @@ class NutritionService:
 
     DEFAULT_KEYS: Iterable[str] = ("calories", "protein", "carbs", "fat", "sugar", "sodium", "fiber")
 
+    # Profile keys are matched anywhere in the ingredient name with a single
+    # scan; the lookahead reports overlapping hits so the earliest entry in
+    # ``NUTRITION_DB`` still takes precedence, as with a linear search.
+    _PROFILE_RE = re.compile("(?=(" + "|".join(re.escape(key) for key in NUTRITION_DB) + "))")
+    _PROFILE_PRIORITY: Mapping[str, int] = {key: index for index, key in enumerate(NUTRITION_DB)}
+    _ZERO_PROFILE: Mapping[str, float] = {key: 0.0 for key in DEFAULT_KEYS}
+
+    # Profiles pre-arranged as rows aligned with ``DEFAULT_KEYS`` so totals can
+    # be computed column by column without per-nutrient dict lookups.
+    _PROFILE_ROWS: Mapping[str, Tuple[float, ...]] = _profile_rows(NUTRITION_DB, DEFAULT_KEYS)
+    _ZERO_ROW: Tuple[float, ...] = tuple(0.0 for _ in DEFAULT_KEYS)
+
     def calculate_nutrition(self, ingredients: Iterable[Any]) -> Dict[str, float]:
         normalised = self._normalise_ingredients(ingredients)
+        if not normalised:
+            return {key: 0.0 for key in self.DEFAULT_KEYS}
 
-        totals: MutableMapping[str, float] = {key: 0.0 for key in self.DEFAULT_KEYS}
-        for ingredient in normalised:
-            profile = self._lookup_profile(ingredient.name)
-            grams = self._to_grams(ingredient.amount, ingredient.unit)
-            multiplier = grams / 100.0
-            for key in self.DEFAULT_KEYS:
-                totals[key] += profile.get(key, 0.0) * multiplier
+        rows = [self._profile_row(ingredient.name) for ingredient in normalised]
+        multipliers = [ingredient.amount * ingredient.grams_per_unit / 100.0 for ingredient in normalised]
 
-        return {key: round(value, 2) for key, value in totals.items()}
+        # Each nutrient total is the dot product of its profile column with the
+        # per-ingredient gram multipliers.
+        totals = (sum(value * multiplier for value, multiplier in zip(column, multipliers)) for column in zip(*rows))
+        return {key: round(total, 2) for key, total in zip(self.DEFAULT_KEYS, totals)}
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
     def _normalise_ingredients(self, ingredients: Iterable[Any]) -> List[NormalisedIngredient]:
+        unit_to_grams = self.UNIT_TO_GRAMS
         normalised: List[NormalisedIngredient] = []
         for item in ingredients:
             if isinstance(item, str):
-                normalised.append(NormalisedIngredient(name=item.lower(), amount=1.0, unit="unit"))
+                normalised.append(
+                    NormalisedIngredient(name=item.lower(), amount=1.0, grams_per_unit=unit_to_grams["unit"])
+                )
                 continue
 
             name = str(item.get("name", "")).lower()
             amount = float(item.get("amount", 1.0) or 1.0)
             unit = str(item.get("unit", "g")).lower()
-            normalised.append(NormalisedIngredient(name=name, amount=amount, unit=unit))
+            # Unknown units are treated as grams.
+            grams_per_unit = unit_to_grams.get(unit, 1.0)
+            normalised.append(NormalisedIngredient(name=name, amount=amount, grams_per_unit=grams_per_unit))
 
         return normalised
 
+    def _match_profile(self, name: str) -> Optional[str]:
+        matches = self._PROFILE_RE.findall(name)
+        if not matches:
+            return None
+        return min(matches, key=self._PROFILE_PRIORITY.__getitem__)
+
     def _lookup_profile(self, name: str) -> Mapping[str, float]:
-        for key, profile in self.NUTRITION_DB.items():
-            if key in name:
-                return profile
-        return {key: 0.0 for key in self.DEFAULT_KEYS}
+        key = self._match_profile(name)
+        return self._ZERO_PROFILE if key is None else self.NUTRITION_DB[key]
+
+    def _profile_row(self, name: str) -> Tuple[float, ...]:
+        key = self._match_profile(name)
+        return self._ZERO_ROW if key is None else self._PROFILE_ROWS[key]
+
+
+_default_service = NutritionService()
+
+
+def calculate_nutrition(ingredients: Iterable[Any]) -> Dict[str, float]:
+    """Estimate nutrition for ``ingredients`` without constructing a service."""
 
-    def _to_grams(self, amount: float, unit: str) -> float:
-        conversion = self.UNIT_TO_GRAMS.get(unit.lower())
-        if conversion is None:
-            return amount
-        return amount * conversion
+    return _default_service.calculate_nutrition(ingredients)
 
 
-__all__ = ["NutritionService"]
+__all__ = ["NutritionService", "calculate_nutrition"]
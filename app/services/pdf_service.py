@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+from typing import BinaryIO, List, Optional
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
@@ -11,57 +11,93 @@ from reportlab.pdfgen import canvas
 class PDFService:
     """Generate PDF representations of recipes."""
 
-    def generate_recipe_pdf(self, recipe, output_path: Optional[str] = None) -> bool:
+    MARGIN_LEFT = 40
+    MARGIN_TOP = 60
+    MARGIN_BOTTOM = 40
+    FONT_SIZE = 12
+    # Body lines that fit between the margins at the default 1.2 leading.
+    LINES_PER_PAGE = int((letter[1] - MARGIN_TOP - MARGIN_BOTTOM) // (FONT_SIZE * 1.2))
+
+    def generate_recipe_pdf(
+        self,
+        recipe,
+        output_path: Optional[str] = None,
+        buffer: Optional[BinaryIO] = None,
+    ) -> bool:
+        """Render ``recipe`` to ``buffer`` when given, otherwise to ``output_path``."""
+
         if recipe is None:
             return False
 
-        output_path = output_path or os.path.join(os.getcwd(), "static", "pdfs", f"recipe_{recipe.id}.pdf")
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        if buffer is not None:
+            target = buffer
+        else:
+            output_path = output_path or os.path.join(os.getcwd(), "static", "pdfs", f"recipe_{recipe.id}.pdf")
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            target = output_path
 
-        doc = canvas.Canvas(output_path, pagesize=letter)
+        doc = canvas.Canvas(target, pagesize=letter)
         width, height = letter
 
-        text = doc.beginText(40, height - 60)
-        text.setFont("Helvetica-Bold", 18)
-        text.textLine(recipe.title or "Recipe")
-        text.setFont("Helvetica", 12)
+        lines = self._body_lines(recipe)
+        # The title takes roughly two body lines on the first page.
+        first_page = self.LINES_PER_PAGE - 2
+        pages = [lines[:first_page]]
+        pages.extend(
+            lines[start:start + self.LINES_PER_PAGE]
+            for start in range(first_page, len(lines), self.LINES_PER_PAGE)
+        )
+
+        for index, page_lines in enumerate(pages):
+            text = doc.beginText(self.MARGIN_LEFT, height - self.MARGIN_TOP)
+            if index == 0:
+                text.setFont("Helvetica-Bold", 18)
+                text.textLine(recipe.title or "Recipe")
+            text.setFont("Helvetica", self.FONT_SIZE)
+            text.textLines("\n".join(page_lines), trim=0)
+            doc.drawText(text)
+            doc.showPage()
+
+        doc.save()
+        return True
+
+    @staticmethod
+    def _body_lines(recipe) -> List[str]:
+        lines: List[str] = []
 
         if recipe.description:
-            text.textLine("")
-            text.textLine(recipe.description)
+            lines.append("")
+            lines.append(recipe.description)
 
-        text.textLine("")
-        text.textLine(f"Prep time: {recipe.prep_time or '-'} minutes")
-        text.textLine(f"Cook time: {recipe.cook_time or '-'} minutes")
-        text.textLine(f"Servings: {recipe.servings or '-'}")
+        lines.append("")
+        lines.append(f"Prep time: {recipe.prep_time or '-'} minutes")
+        lines.append(f"Cook time: {recipe.cook_time or '-'} minutes")
+        lines.append(f"Servings: {recipe.servings or '-'}")
 
-        text.textLine("")
-        text.textLine("Ingredients:")
+        lines.append("")
+        lines.append("Ingredients:")
         for ingredient in getattr(recipe, "ingredients", []):
             amount = ingredient.amount if ingredient.amount is not None else ""
             unit = ingredient.unit or ""
             parts = [str(part) for part in (amount, unit, ingredient.name) if part]
-            text.textLine(f"  - {' '.join(parts)}")
+            lines.append(f"  - {' '.join(parts)}")
 
         if getattr(recipe, "instructions", None):
-            text.textLine("")
-            text.textLine("Instructions:")
+            lines.append("")
+            lines.append("Instructions:")
             for line in recipe.instructions.splitlines():
-                text.textLine(f"  {line.strip()}")
+                lines.append(f"  {line.strip()}")
 
         if getattr(recipe, "nutrition", None):
             nutrition = recipe.nutrition.to_dict()
-            text.textLine("")
-            text.textLine("Nutrition:")
+            lines.append("")
+            lines.append("Nutrition:")
             for key, value in nutrition.items():
                 if key in {"id", "recipe_id"}:
                     continue
-                text.textLine(f"  {key.capitalize()}: {value}")
+                lines.append(f"  {key.capitalize()}: {value}")
 
-        doc.drawText(text)
-        doc.showPage()
-        doc.save()
-        return True
+        return lines
 
 
 __all__ = ["PDFService"]
@@ -2,13 +2,15 @@
 from __future__ import annotations
 
 import os
-import time
+import uuid
+from datetime import datetime
 from typing import Any, Dict, Iterable, List, Optional
 
-from sqlalchemy import asc, desc, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, asc, desc, or_
+from sqlalchemy.orm import Session, contains_eager, joinedload, selectinload
 
 from database import Ingredient, NutritionInfo, Recipe
+from .async_writer import AsyncPDFWriter
 from .pdf_service import PDFService
 
 
@@ -24,6 +26,7 @@ class RecipeService:
         self.session = session
         self.pdf_service = pdf_service or PDFService()
         self.pdf_output_dir = pdf_output_dir or os.path.join(os.getcwd(), "static", "pdfs")
+        self._pdf_dir_ready = False
 
     # ------------------------------------------------------------------
     # Query helpers
@@ -32,7 +35,9 @@ class RecipeService:
         """Return recipes optionally filtered by the supplied parameters."""
 
         filters = filters or {}
-        query = self.session.query(Recipe).distinct()
+        # Callers serialise or render every relationship, so load them up front
+        # in a fixed number of queries rather than one per recipe.
+        query = self.session.query(Recipe).options(selectinload(Recipe.ingredients), selectinload(Recipe.tags))
 
         search_term = filters.get("search")
         if search_term:
@@ -41,17 +46,21 @@ class RecipeService:
 
         ingredient_name = filters.get("ingredient")
         if ingredient_name:
+            # EXISTS keeps one row per recipe, so no DISTINCT is required.
             ilike_pattern = f"%{ingredient_name}%"
-            query = query.join(Recipe.ingredients).filter(Ingredient.name.ilike(ilike_pattern))
+            query = query.filter(Recipe.ingredients.any(Ingredient.name.ilike(ilike_pattern)))
 
         min_calories = filters.get("min_calories")
         max_calories = filters.get("max_calories")
         if min_calories is not None or max_calories is not None:
-            query = query.join(Recipe.nutrition, isouter=True)
+            # Reuse the filtering join to populate ``nutrition`` (one row per recipe).
+            query = query.outerjoin(Recipe.nutrition).options(contains_eager(Recipe.nutrition))
             if min_calories is not None:
                 query = query.filter(NutritionInfo.calories >= float(min_calories))
             if max_calories is not None:
                 query = query.filter(NutritionInfo.calories <= float(max_calories))
+        else:
+            query = query.options(joinedload(Recipe.nutrition))
 
         sort_by = filters.get("sort_by")
         sort_direction = filters.get("sort_direction", "asc").lower()
@@ -70,10 +79,47 @@ class RecipeService:
 
         return query.all()
 
-    def get_recipe_by_id(self, recipe_id: int) -> Optional[Recipe]:
-        """Return a recipe by its primary key."""
+    def get_recipe_cards(self, limit: int) -> List[Row]:
+        """Return the newest recipes with only the columns a summary card shows."""
+
+        return (
+            self.session.query(
+                Recipe.id,
+                Recipe.title,
+                Recipe.description,
+                Recipe.image_url,
+                Recipe.prep_time,
+                Recipe.cook_time,
+                Recipe.servings,
+                Recipe.created_at,
+                NutritionInfo.calories,
+                NutritionInfo.protein,
+            )
+            .outerjoin(Recipe.nutrition)
+            .order_by(Recipe.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
+    def get_recipe_by_id(self, recipe_id: int, load_relationships: bool = True) -> Optional[Recipe]:
+        """Return a recipe by its primary key.
+
+        Relationships are loaded with the row unless ``load_relationships`` is
+        false, for callers that only need the recipe itself.
+        """
+
+        if not load_relationships:
+            return self.session.get(Recipe, recipe_id)
 
-        return self.session.get(Recipe, recipe_id)
+        return self.session.get(
+            Recipe,
+            recipe_id,
+            options=[
+                selectinload(Recipe.ingredients),
+                selectinload(Recipe.tags),
+                joinedload(Recipe.nutrition),
+            ],
+        )
 
     # ------------------------------------------------------------------
     # Mutating operations
@@ -94,6 +140,9 @@ class RecipeService:
             servings=data.get("servings"),
             image_url=data.get("image_url"),
             source_url=data.get("source_url"),
+            # A new recipe has no tags; initialising the collection spares the
+            # serialiser a lazy SELECT after commit.
+            tags=[],
         )
 
         self._apply_ingredients(recipe, data.get("ingredients"))
@@ -101,7 +150,6 @@ class RecipeService:
 
         self.session.add(recipe)
         self.session.commit()
-        self.session.refresh(recipe)
         return recipe
 
     def update_recipe(self, recipe_id: int, data: Dict[str, Any]) -> Optional[Recipe]:
@@ -125,21 +173,24 @@ class RecipeService:
                 setattr(recipe, field, data[field])
 
         if "ingredients" in data:
-            recipe.ingredients.clear()
-            self._apply_ingredients(recipe, data.get("ingredients"))
+            self._apply_ingredients(recipe, data.get("ingredients"), replace=True)
 
         if "nutrition" in data:
             self._apply_nutrition(recipe, data.get("nutrition"))
 
+        if "ingredients" in data or "nutrition" in data:
+            # Relationship-only edits leave the recipes row clean, so bump the
+            # timestamp explicitly; serialisation caches key on it.
+            recipe.updated_at = datetime.utcnow()
+
         self.session.add(recipe)
         self.session.commit()
-        self.session.refresh(recipe)
         return recipe
 
     def delete_recipe(self, recipe_id: int) -> bool:
         """Delete a recipe returning ``True`` if the record existed."""
 
-        recipe = self.get_recipe_by_id(recipe_id)
+        recipe = self.get_recipe_by_id(recipe_id, load_relationships=False)
         if recipe is None:
             return False
 
@@ -154,10 +205,7 @@ class RecipeService:
         if recipe is None:
             return None
 
-        os.makedirs(self.pdf_output_dir, exist_ok=True)
-        filename = f"recipe_{recipe.id}_{int(time.time())}.pdf"
-        output_path = os.path.join(self.pdf_output_dir, filename)
-
+        output_path = self._pdf_output_path(recipe)
         if self.pdf_service.generate_recipe_pdf(recipe, output_path):
             recipe.pdf_path = output_path
             self.session.add(recipe)
@@ -166,22 +214,53 @@ class RecipeService:
 
         return None
 
+    def queue_pdf(self, recipe_id: int, writer: AsyncPDFWriter) -> Optional[str]:
+        """Queue PDF generation on ``writer`` and return the path it will write.
+
+        ``pdf_path`` is updated by the writer once rendering has finished.
+        """
+
+        recipe = self.get_recipe_by_id(recipe_id, load_relationships=False)
+        if recipe is None:
+            return None
+
+        output_path = self._pdf_output_path(recipe)
+        writer.submit(recipe.id, output_path)
+        return output_path
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _apply_ingredients(self, recipe: Recipe, ingredients: Optional[Iterable[Dict[str, Any]]]) -> None:
-        if not ingredients:
+    def _pdf_output_path(self, recipe: Recipe) -> str:
+        if not self._pdf_dir_ready:
+            os.makedirs(self.pdf_output_dir, exist_ok=True)
+            self._pdf_dir_ready = True
+
+        # A random suffix keeps files from requests in the same second apart.
+        filename = f"recipe_{recipe.id}_{uuid.uuid4().hex[:8]}.pdf"
+        return os.path.join(self.pdf_output_dir, filename)
+
+    def _apply_ingredients(
+        self,
+        recipe: Recipe,
+        ingredients: Optional[Iterable[Dict[str, Any]]],
+        replace: bool = False,
+    ) -> None:
+        if not ingredients and not replace:
             return
 
-        for payload in ingredients:
-            if not payload:
-                continue
-            ingredient = Ingredient(
+        # Assigning the whole collection fires a single collection event and
+        # lets the flush batch the association rows, instead of one append
+        # (or, when replacing, one removal) per ingredient.
+        recipe.ingredients = [
+            Ingredient(
                 name=payload.get("name"),
                 amount=payload.get("amount"),
                 unit=payload.get("unit"),
             )
-            recipe.ingredients.append(ingredient)
+            for payload in ingredients or ()
+            if payload
+        ]
 
     def _apply_nutrition(self, recipe: Recipe, nutrition: Optional[Dict[str, Any]]) -> None:
         if not nutrition:
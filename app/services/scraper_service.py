@@ -4,8 +4,6 @@ from __future__ import annotations
 import re
 from typing import Any, Dict, List, Optional
 
-import trafilatura
-
 from .nutrition_service import NutritionService
 
 
@@ -14,6 +12,10 @@ class ScraperService:
 
     INGREDIENT_PATTERN = re.compile(r"^[-•]\s*")
     NUMBER_PATTERN = re.compile(r"(\d+)")
+    # One case-insensitive match replaces lowering each line and probing it
+    # with a chain of ``startswith`` calls.
+    SECTION_PATTERN = re.compile(r"(ingredients|instructions|prep time|cook time|servings)", re.IGNORECASE)
+    INSTRUCTION_PREFIX_CHARS = "0123456789.-) "
 
     def __init__(self, nutrition_service: Optional[NutritionService] = None) -> None:
         self.nutrition_service = nutrition_service or NutritionService()
@@ -27,6 +29,10 @@ class ScraperService:
         if not url:
             raise ValueError("A URL must be provided")
 
+        # trafilatura takes longer to import than the rest of the app combined
+        # and only this path needs it, so workers load it on first scrape.
+        import trafilatura
+
         downloaded = trafilatura.fetch_url(url)
         if not downloaded:
             raise ValueError("Unable to retrieve the requested URL")
@@ -51,23 +57,20 @@ class ScraperService:
         instructions: List[str] = []
         prep_time = cook_time = servings = None
 
+        match_section = self.SECTION_PATTERN.match
         section: Optional[str] = None
         for line in lines[1:]:
-            lower = line.lower()
-            if lower.startswith("ingredients"):
-                section = "ingredients"
-                continue
-            if lower.startswith("instructions"):
-                section = "instructions"
-                continue
-            if lower.startswith("prep time"):
-                prep_time = self._extract_number(line)
-                continue
-            if lower.startswith("cook time"):
-                cook_time = self._extract_number(line)
-                continue
-            if lower.startswith("servings"):
-                servings = self._extract_number(line)
+            heading = match_section(line)
+            if heading is not None:
+                kind = heading.group(1).lower()
+                if kind == "prep time":
+                    prep_time = self._extract_number(line)
+                elif kind == "cook time":
+                    cook_time = self._extract_number(line)
+                elif kind == "servings":
+                    servings = self._extract_number(line)
+                else:
+                    section = kind
                 continue
 
             if section == "ingredients":
@@ -99,25 +102,25 @@ class ScraperService:
         if not tokens:
             return {"name": line, "amount": None, "unit": None}
 
-        name_tokens = tokens
+        start = 0
         amount: Optional[float] = None
         unit: Optional[str] = None
 
         try:
             amount = float(tokens[0])
-            name_tokens = tokens[1:]
-            if name_tokens:
-                unit = name_tokens[0]
-                name_tokens = name_tokens[1:]
+            start = 1
+            if len(tokens) > 1:
+                unit = tokens[1]
+                start = 2
         except ValueError:
             pass
 
-        name = " ".join(name_tokens) if name_tokens else (unit or line)
+        name = " ".join(tokens[start:]) or unit or line
         return {"name": name, "amount": amount, "unit": unit}
 
     @staticmethod
     def _normalise_instruction(line: str) -> str:
-        return line.lstrip("0123456789.-) ")
+        return line.lstrip(ScraperService.INSTRUCTION_PREFIX_CHARS)
 
     @staticmethod
     def _extract_number(text: str) -> Optional[int]:
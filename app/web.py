@@ -1,25 +1,36 @@
 """User-facing HTML routes for the Recipe Planner application."""
 from __future__ import annotations
 
+import hashlib
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from types import SimpleNamespace
-from typing import Any, Dict, List, Mapping, Optional, Sequence
+from functools import lru_cache
+from urllib.parse import quote
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
 
 from flask import (
     Blueprint,
     abort,
     current_app,
     flash,
+    g,
+    get_flashed_messages,
+    make_response,
     redirect,
     render_template,
     request,
     send_file,
+    session as flask_session,
+    stream_template,
     url_for,
 )
 
 from werkzeug.datastructures import ImmutableMultiDict
 
+from sqlalchemy import Row, case, func, insert, select, update
 from sqlalchemy.orm import selectinload
 
 from database import (
@@ -110,116 +121,257 @@ _INGREDIENT_ICON_MAP = {
     "dill": "/static/images/ingredients/herbs.svg",
 }
 
+_DEFAULT_INGREDIENT_ICON = "/static/images/ingredients/default.svg"
+
+# Icon keys are found in one regex scan.  Alternatives are ordered longest
+# first so the most specific key at the earliest position wins (``peppercorn``
+# over ``pepper``), independent of the map's declaration order.
+_ICON_RE = re.compile(
+    "(" + "|".join(re.escape(key) for key in sorted(_INGREDIENT_ICON_MAP, key=len, reverse=True)) + ")"
+)
+
 
 @views_bp.app_template_filter("ingredient_icon")
 def ingredient_icon_filter(value: Optional[str]) -> str:
     """Return the icon path for the supplied ingredient name."""
 
     if not value:
-        return "/static/images/ingredients/default.svg"
+        return _DEFAULT_INGREDIENT_ICON
+
+    return _lookup_ingredient_icon(value.lower().strip())
+
+
+@lru_cache(maxsize=4096)
+def _lookup_ingredient_icon(lower_value: str) -> str:
+    """Resolve a normalised ingredient name; names repeat across recipes."""
 
-    lower_value = value.lower().strip()
     if lower_value in _INGREDIENT_ICON_MAP:
         return _INGREDIENT_ICON_MAP[lower_value]
 
-    for key, path in _INGREDIENT_ICON_MAP.items():
-        if key in lower_value:
-            return path
-
-    return "/static/images/ingredients/default.svg"
+    match = _ICON_RE.search(lower_value)
+    return _INGREDIENT_ICON_MAP[match.group(1)] if match else _DEFAULT_INGREDIENT_ICON
 
 
 def _get_session():
-    """Return the scoped session factory bound to the current app."""
+    """Return the scoped session registry bound to the current app.
+
+    The registry is memoised on the app once built; the factory is only
+    consulted again when ``SQLALCHEMY_DATABASE_URI`` has changed.
+    """
+
+    extensions = current_app.extensions
+    registry = extensions["session_registry"]
+    if registry is None or extensions["db_uri"] != current_app.config.get("SQLALCHEMY_DATABASE_URI"):
+        registry = extensions["get_session_factory"]()
+    return registry
+
+
+def _request_session():
+    """Return the database session shared by everything handling this request.
 
-    session_factory = current_app.extensions["get_session_factory"]()
-    return session_factory
+    It is the scoped-session registry's session for the current thread,
+    memoised on ``g``; the app's ``teardown_appcontext`` hook closes it.
+    """
+
+    session = g.get("db_session")
+    if session is None:
+        session = g.db_session = _get_session()()
+    return session
 
 
 def _get_services():
-    """Instantiate commonly used services for the current request."""
+    """Return the request session and the app-wide service instances."""
 
-    session_factory = _get_session()
-    session = session_factory()
-    recipe_service = RecipeService(session)
-    meal_plan_service = MealPlanService(session)
-    return session, recipe_service, meal_plan_service
+    extensions = current_app.extensions
+    return _request_session(), extensions["recipe_service"], extensions["meal_plan_service"]
 
 
-def _summarise_meal_plans(session) -> List[SimpleNamespace]:
-    """Return lightweight representations of the available meal plans."""
+def _scan_template_stamp(template_folder: str) -> float:
+    """Return the newest modification time of any file under ``template_folder``."""
 
-    meal_plans: Sequence[MealPlan] = (
-        session.query(MealPlan)
-        .options(selectinload(MealPlan.shopping_list))
-        .order_by(MealPlan.created_at.desc())
-        .all()
-    )
+    latest = 0.0
+    for root, _dirs, files in os.walk(template_folder):
+        for name in files:
+            latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+    return latest
 
-    summaries: List[SimpleNamespace] = []
-    for meal_plan in meal_plans:
-        summaries.append(
-            SimpleNamespace(
-                id=meal_plan.id,
-                name=meal_plan.name,
-                start_date=meal_plan.start_date,
-                end_date=meal_plan.end_date,
-                shopping_list_name=meal_plan.shopping_list.name if meal_plan.shopping_list else None,
-            )
-        )
 
-    return summaries
+_cached_template_stamp = lru_cache(maxsize=None)(_scan_template_stamp)
 
 
-def _summarise_shopping_lists(session) -> List[SimpleNamespace]:
-    """Return lightweight data for all shopping lists."""
+def _template_stamp() -> float:
+    """Return the template version that ETags include so deploys change them.
 
-    shopping_lists: Sequence[ShoppingList] = (
-        session.query(ShoppingList)
-        .options(selectinload(ShoppingList.items), selectinload(ShoppingList.meal_plan))
-        .order_by(ShoppingList.created_at.desc())
-        .all()
-    )
+    The scan is cached only while ``_template`` is caching compiled templates
+    too; with auto-reload on, edits are rendered straight away, so the stamp
+    is recomputed for every ETag.
+    """
 
-    summaries: List[SimpleNamespace] = []
-    for shopping_list in shopping_lists:
-        summaries.append(
-            SimpleNamespace(
-                id=shopping_list.id,
-                name=shopping_list.name,
-                created_at=shopping_list.created_at,
-                updated_at=shopping_list.updated_at,
-                item_count=len(shopping_list.items),
-                meal_plan_name=shopping_list.meal_plan.name if shopping_list.meal_plan else None,
-            )
-        )
+    app = current_app
+    if app.jinja_env.auto_reload:
+        return _scan_template_stamp(app.template_folder)
+    return _cached_template_stamp(app.template_folder)
 
-    return summaries
 
+def _template(name: str):
+    """Return the compiled template for ``name``, held on the app once loaded.
 
-def _summarise_inventories(session) -> List[SimpleNamespace]:
-    """Return lightweight data for available pantry inventories."""
+    ``render_template`` accepts the ``Template`` object directly, which skips
+    the loader cache lookup on every render.  With template auto-reload on
+    (debug), the name is passed through so edits are still picked up.
+    """
 
-    inventories: Sequence[Inventory] = (
-        session.query(Inventory)
-        .options(selectinload(Inventory.items))
-        .order_by(Inventory.created_at.desc())
+    app = current_app
+    if app.jinja_env.auto_reload:
+        return name
+
+    templates = app.extensions.setdefault("compiled_templates", {})
+    template = templates.get(name)
+    if template is None:
+        template = templates[name] = app.jinja_env.get_template(name)
+    return template
+
+
+def _page_etag(session, *models) -> Optional[str]:
+    """Return an ETag fingerprinting the tables a listing page renders.
+
+    A single aggregate query (row count plus newest change per table) stands
+    in for the page's full set of queries.  ``None`` is returned while flash
+    messages are pending, since those make the page differ per visit.
+    """
+
+    if flask_session.get("_flashes"):
+        return None
+
+    columns = []
+    for model in models:
+        marker = getattr(model, "updated_at", model.id)
+        columns.append(select(func.count()).select_from(model).scalar_subquery())
+        columns.append(select(func.max(marker)).scalar_subquery())
+    return _fingerprint_etag(tuple(session.execute(select(*columns)).one()))
+
+
+def _fingerprint_etag(fingerprint: Any) -> str:
+    """Hash ``fingerprint`` with the request path and template versions."""
+
+    stamp = _template_stamp()
+    payload = repr((request.full_path, stamp, fingerprint)).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _not_modified(etag: Optional[str]):
+    """Return a 304 response when the client already holds ``etag``."""
+
+    if etag is None or etag not in request.if_none_match:
+        return None
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+
+def _render_with_etag(etag: Optional[str], template: str, **context: Any):
+    """Render ``template`` and tag the response so clients revalidate it."""
+
+    response = make_response(render_template(_template(template), **context))
+    if etag is not None:
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+    return response
+
+
+def _stream_page(template: str, etag: Optional[str] = None, **context: Any):
+    """Stream ``template`` so the page head is sent while the body renders.
+
+    Pending flash messages are popped up front: the session cookie is written
+    with the headers, before the template gets to read them.
+
+    The request's teardown runs before the first chunk renders, so the
+    database session is not removed there. The template may still lazy-load
+    from the objects in ``context``, and the session is released only when
+    the response is closed.
+    """
+
+    get_flashed_messages()
+    response = current_app.response_class(
+        stream_template(_template(template), **context), mimetype="text/html"
+    )
+    session_registry = current_app.extensions.get("db_session_factory")
+    if session_registry is not None:
+        g.defer_session_removal = True
+        response.call_on_close(session_registry.remove)
+    if etag is not None:
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+    return response
+
+
+def _shopping_list_item_count():
+    """Return a correlated subquery counting the items of each shopping list."""
+
+    return (
+        select(func.count(ShoppingListItem.id))
+        .where(ShoppingListItem.shopping_list_id == ShoppingList.id)
+        .correlate(ShoppingList)
+        .scalar_subquery()
+    )
+
+
+def _summarise_meal_plans(session) -> List[Row]:
+    """Return lightweight rows describing the available meal plans."""
+
+    return (
+        session.query(
+            MealPlan.id,
+            MealPlan.name,
+            MealPlan.start_date,
+            MealPlan.end_date,
+            ShoppingList.name.label("shopping_list_name"),
+        )
+        .outerjoin(MealPlan.shopping_list)
+        .order_by(MealPlan.created_at.desc())
         .all()
     )
 
-    summaries: List[SimpleNamespace] = []
-    for inventory in inventories:
-        summaries.append(
-            SimpleNamespace(
-                id=inventory.id,
-                name=inventory.name,
-                created_at=inventory.created_at,
-                updated_at=inventory.updated_at,
-                item_count=len(inventory.items),
-            )
+
+def _summarise_shopping_lists(session) -> List[Row]:
+    """Return lightweight rows for all shopping lists."""
+
+    return (
+        session.query(
+            ShoppingList.id,
+            ShoppingList.name,
+            ShoppingList.created_at,
+            ShoppingList.updated_at,
+            _shopping_list_item_count().label("item_count"),
+            MealPlan.name.label("meal_plan_name"),
         )
+        .outerjoin(ShoppingList.meal_plan)
+        .order_by(ShoppingList.created_at.desc())
+        .all()
+    )
 
-    return summaries
+
+def _summarise_inventories(session) -> List[Row]:
+    """Return lightweight rows for available pantry inventories."""
+
+    item_count = (
+        select(func.count(InventoryItem.id))
+        .where(InventoryItem.inventory_id == Inventory.id)
+        .correlate(Inventory)
+        .scalar_subquery()
+    )
+    return (
+        session.query(
+            Inventory.id,
+            Inventory.name,
+            Inventory.created_at,
+            Inventory.updated_at,
+            item_count.label("item_count"),
+        )
+        .order_by(Inventory.created_at.desc())
+        .all()
+    )
 
 
 def _parse_date(value: Optional[str]):
@@ -233,21 +385,39 @@ def _parse_date(value: Optional[str]):
 
 
 def _coerce_int(value: Optional[str]) -> Optional[int]:
-    if value in (None, ""):
+    # Form values are always strings; blanks and missing fields are both
+    # falsy, so the common empty case never reaches the conversion.
+    if not value:
         return None
     try:
         return int(value)
-    except (TypeError, ValueError):
+    except ValueError:
         return None
 
 
 def _coerce_float(value: Optional[str]) -> Optional[float]:
-    if value in (None, ""):
+    if not value:
         return None
     try:
         return float(value)
-    except (TypeError, ValueError):
+    except ValueError:
+        return None
+
+
+def _ingredient_entry(name: str, amount: str, unit: str) -> Optional[Dict[str, Any]]:
+    """Build one ingredient payload from a form row, skipping blank names."""
+
+    name = name.strip()
+    if not name:
         return None
+    ingredient: Dict[str, Any] = {"name": name}
+    coerced_amount = _coerce_float(amount)
+    if coerced_amount is not None:
+        ingredient["amount"] = coerced_amount
+    unit = unit.strip()
+    if unit:
+        ingredient["unit"] = unit
+    return ingredient
 
 
 def _collect_recipe_payload(form: ImmutableMultiDict[str, str]) -> Dict[str, Any]:
@@ -264,23 +434,12 @@ def _collect_recipe_payload(form: ImmutableMultiDict[str, str]) -> Dict[str, Any
         "source_url": form.get("source_url", "").strip() or None,
     }
 
-    ingredient_names = form.getlist("ingredient_name")
-    ingredient_amounts = form.getlist("ingredient_amount")
-    ingredient_units = form.getlist("ingredient_unit")
-
-    ingredients: List[Dict[str, Any]] = []
-    for name, amount, unit in zip(ingredient_names, ingredient_amounts, ingredient_units):
-        name = (name or "").strip()
-        if not name:
-            continue
-        ingredient: Dict[str, Any] = {"name": name}
-        coerced_amount = _coerce_float(amount)
-        if coerced_amount is not None:
-            ingredient["amount"] = coerced_amount
-        unit = (unit or "").strip()
-        if unit:
-            ingredient["unit"] = unit
-        ingredients.append(ingredient)
+    names, amounts, units = map(form.getlist, ("ingredient_name", "ingredient_amount", "ingredient_unit"))
+    ingredients = [
+        ingredient
+        for row in zip(names, amounts, units)
+        if (ingredient := _ingredient_entry(*row)) is not None
+    ]
 
     if ingredients:
         payload["ingredients"] = ingredients
@@ -298,33 +457,32 @@ def _collect_recipe_payload(form: ImmutableMultiDict[str, str]) -> Dict[str, Any
     return payload
 
 
-def _payload_to_preview(payload: Mapping[str, Any]) -> SimpleNamespace:
-    """Convert a payload dict into an object usable by the templates."""
+def _payload_to_preview(payload: Mapping[str, Any]) -> Dict[str, Any]:
+    """Convert a payload into the plain dict the form templates read from.
+
+    Jinja resolves ``recipe.title`` against dict keys, so no wrapper objects
+    are needed; none of the field names shadow ``dict`` methods.
+    """
 
     ingredients_payload = payload.get("ingredients", []) or []
     ingredients = [
-        SimpleNamespace(name=item.get("name"), amount=item.get("amount"), unit=item.get("unit"))
+        {"name": item.get("name"), "amount": item.get("amount"), "unit": item.get("unit")}
         for item in ingredients_payload
     ]
 
-    nutrition_payload = payload.get("nutrition") or {}
-    nutrition = None
-    if nutrition_payload:
-        nutrition = SimpleNamespace(**nutrition_payload)
-
-    return SimpleNamespace(
-        id=payload.get("id"),
-        title=payload.get("title"),
-        description=payload.get("description"),
-        instructions=payload.get("instructions"),
-        prep_time=payload.get("prep_time"),
-        cook_time=payload.get("cook_time"),
-        servings=payload.get("servings"),
-        image_url=payload.get("image_url"),
-        source_url=payload.get("source_url"),
-        ingredients=ingredients,
-        nutrition=nutrition,
-    )
+    return {
+        "id": payload.get("id"),
+        "title": payload.get("title"),
+        "description": payload.get("description"),
+        "instructions": payload.get("instructions"),
+        "prep_time": payload.get("prep_time"),
+        "cook_time": payload.get("cook_time"),
+        "servings": payload.get("servings"),
+        "image_url": payload.get("image_url"),
+        "source_url": payload.get("source_url"),
+        "ingredients": ingredients,
+        "nutrition": dict(payload.get("nutrition") or {}) or None,
+    }
 
 
 def _validate_recipe_payload(payload: Mapping[str, Any]) -> List[str]:
@@ -343,54 +501,193 @@ def _ensure_shopping_list(meal_plan, recipe: Recipe, session) -> None:
         session.add(shopping_list)
         session.flush()
 
-    existing_items = {item.ingredient_id: item for item in shopping_list.items}
+    # New items go in as one executemany INSERT.  Quantities on items already
+    # on the list are added in SQL by a single UPDATE, so the stored values
+    # never round-trip through Python and concurrent additions are not lost.
+    existing_ids = set(
+        session.scalars(
+            select(ShoppingListItem.ingredient_id).where(ShoppingListItem.shopping_list_id == shopping_list.id)
+        )
+    )
+
+    new_rows: Dict[int, Dict[str, Any]] = {}
+    added_amounts: Dict[int, float] = {}
+    new_units: Dict[int, str] = {}
     for ingredient in recipe.ingredients:
         if ingredient is None or ingredient.id is None:
             continue
-        item = existing_items.get(ingredient.id)
-        if item is None:
-            item = ShoppingListItem(
-                shopping_list=shopping_list,
-                ingredient=ingredient,
-                quantity=ingredient.amount,
-                unit=ingredient.unit,
-            )
-            session.add(item)
-            existing_items[ingredient.id] = item
-        else:
+        if ingredient.id in existing_ids:
             if ingredient.amount is not None:
-                item.quantity = (item.quantity or 0) + ingredient.amount
+                added_amounts[ingredient.id] = added_amounts.get(ingredient.id, 0) + ingredient.amount
             if ingredient.unit:
-                item.unit = ingredient.unit
+                new_units[ingredient.id] = ingredient.unit
+            continue
+
+        row = new_rows.get(ingredient.id)
+        if row is None:
+            new_rows[ingredient.id] = {
+                "shopping_list_id": shopping_list.id,
+                "ingredient_id": ingredient.id,
+                "quantity": ingredient.amount,
+                "unit": ingredient.unit,
+            }
+            continue
+        if ingredient.amount is not None:
+            row["quantity"] = (row["quantity"] or 0) + ingredient.amount
+        if ingredient.unit:
+            row["unit"] = ingredient.unit
+
+    if new_rows:
+        session.execute(insert(ShoppingListItem), list(new_rows.values()))
+    if added_amounts or new_units:
+        values: Dict[str, Any] = {}
+        if added_amounts:
+            values["quantity"] = case(
+                (
+                    ShoppingListItem.ingredient_id.in_(added_amounts),
+                    func.coalesce(ShoppingListItem.quantity, 0)
+                    + case(added_amounts, value=ShoppingListItem.ingredient_id),
+                ),
+                else_=ShoppingListItem.quantity,
+            )
+        if new_units:
+            values["unit"] = case(new_units, value=ShoppingListItem.ingredient_id, else_=ShoppingListItem.unit)
+        session.execute(
+            update(ShoppingListItem)
+            .where(
+                ShoppingListItem.shopping_list_id == shopping_list.id,
+                ShoppingListItem.ingredient_id.in_(added_amounts.keys() | new_units.keys()),
+            )
+            .values(**values)
+        )
+    if new_rows:
+        # The bulk INSERT bypasses the identity map.
+        session.expire(shopping_list, ["items"])
 
     session.commit()
 
 
+_TRUE_VALUES = frozenset(("1", "true", "yes", "on"))
+
+
 def _parse_boolean(value: Optional[str]) -> bool:
-    return str(value).lower() in {"1", "true", "yes", "on"}
+    return value is not None and value.lower() in _TRUE_VALUES
 
 
-@views_bp.route("/", endpoint="index")
-def homepage():
-    """Render the homepage with recent recipes, meal plans, and shopping lists."""
+def _recent_recipe_cards(session) -> Sequence:
+    return RecipeService(session).get_recipe_cards(6)
 
-    session_factory = _get_session()
-    session = session_factory()
-    recipe_service = RecipeService(session)
-    meal_plan_service = MealPlanService(session)
 
-    recent_recipes: Sequence = recipe_service.get_recipes(
-        {"sort_by": "created_at", "sort_direction": "desc", "limit": 6}
-    )
-    recent_meal_plans: Sequence = meal_plan_service.get_meal_plans({"limit": 3})
-    recent_lists: Sequence = (
-        session.query(ShoppingList)
+def _recent_meal_plans(session) -> Sequence:
+    return MealPlanService(session).get_meal_plans({"limit": 3})
+
+
+def _recent_shopping_lists(session) -> Sequence:
+    return (
+        session.query(
+            ShoppingList.id,
+            ShoppingList.name,
+            _shopping_list_item_count().label("item_count"),
+            MealPlan.name.label("meal_plan_name"),
+        )
+        .outerjoin(ShoppingList.meal_plan)
         .order_by(ShoppingList.created_at.desc())
         .limit(3)
         .all()
     )
 
-    return render_template(
+
+def _homepage_etag(recipes: Sequence, meal_plans: Sequence, shopping_lists: Sequence) -> Optional[str]:
+    """Return an ETag over exactly the values the homepage cards show."""
+
+    if flask_session.get("_flashes"):
+        return None
+
+    fingerprint = (
+        [tuple(card) for card in recipes],
+        [(plan.id, plan.name, plan.start_date, plan.end_date) for plan in meal_plans],
+        [tuple(row) for row in shopping_lists],
+    )
+    return _fingerprint_etag(fingerprint)
+
+
+_loader_executor_lock = threading.Lock()
+
+
+def _loader_pool_size(config: Mapping[str, Any]) -> int:
+    """Return how many loader threads the homepage may use at once.
+
+    Every request thread can need three loaders at the same time, but each
+    loader holds a database connection, so the pool never exceeds what the
+    engine is allowed to open.
+    """
+
+    configured = config.get("PAGE_LOADER_WORKERS")
+    if configured:
+        return configured
+
+    connections = config.get("DB_POOL_SIZE", 10) + config.get("DB_MAX_OVERFLOW", 20)
+    return max(3, min(config.get("REQUEST_THREADS", 8) * 3, connections))
+
+
+def _get_loader_executor() -> ThreadPoolExecutor:
+    extensions = current_app.extensions
+    with _loader_executor_lock:
+        executor = extensions.get("page_loader_executor")
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=_loader_pool_size(current_app.config), thread_name_prefix="page-loader"
+            )
+            extensions["page_loader_executor"] = executor
+        return executor
+
+
+def _load_concurrently(
+    executor: ThreadPoolExecutor, session_maker, loaders: Sequence[Callable[[Any], Any]]
+) -> List[Any]:
+    """Run independent read-only ``loaders`` in parallel, each with its own session.
+
+    Results are fully loaded before the sessions close, so the returned rows
+    and objects stay usable while the page renders.
+    """
+
+    def run(loader: Callable[[Any], Any]) -> Any:
+        session = session_maker()
+        try:
+            return loader(session)
+        finally:
+            session.close()
+
+    futures = [executor.submit(run, loader) for loader in loaders]
+    return [future.result() for future in futures]
+
+
+@views_bp.route("/", endpoint="index")
+def homepage():
+    """Render the homepage with recent recipes, meal plans, and shopping lists."""
+
+    session = _request_session()
+
+    loaders = (_recent_recipe_cards, _recent_meal_plans, _recent_shopping_lists)
+    if session.get_bind().dialect.name == "sqlite":
+        # SQLite is in-process, so there is no round-trip latency to overlap.
+        results = [loader(session) for loader in loaders]
+    else:
+        results = _load_concurrently(
+            _get_loader_executor(), current_app.extensions["db_sessionmaker"], loaders
+        )
+    recent_recipes, recent_meal_plans, recent_lists = results
+
+    # The three LIMIT queries are all the page needs, so the ETag fingerprints
+    # their results rather than scanning whole tables; a 304 still skips the
+    # render.
+    etag = _homepage_etag(recent_recipes, recent_meal_plans, recent_lists)
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+
+    return _render_with_etag(
+        etag,
         "index.html",
         recipes=recent_recipes,
         meal_plans=recent_meal_plans,
@@ -404,23 +701,23 @@ def scraper():
 
     if request.method == "GET":
         return render_template(
-            "scraper.html", recipe_data=None, recipe_payload=None, scrape_url=request.args.get("url")
+            _template("scraper.html"), recipe_data=None, recipe_payload=None, scrape_url=request.args.get("url")
         )
 
     url = (request.form.get("url") or "").strip()
     if not url:
         flash("Please provide a recipe URL to scrape.", "danger")
-        return render_template("scraper.html", recipe_data=None, recipe_payload=None, scrape_url=None)
+        return render_template(_template("scraper.html"), recipe_data=None, recipe_payload=None, scrape_url=None)
 
     try:
         scraped_payload = ScraperService.scrape_recipe(url)
     except ValueError as exc:
         flash(str(exc), "danger")
-        return render_template("scraper.html", recipe_data=None, recipe_payload=None, scrape_url=url)
+        return render_template(_template("scraper.html"), recipe_data=None, recipe_payload=None, scrape_url=url)
 
     preview = _payload_to_preview(scraped_payload)
     return render_template(
-        "scraper.html", recipe_data=preview, recipe_payload=scraped_payload, scrape_url=url
+        _template("scraper.html"), recipe_data=preview, recipe_payload=scraped_payload, scrape_url=url
     )
 
 
@@ -437,7 +734,7 @@ def save_scraped_recipe():
         for error in errors:
             flash(error, "danger")
         return render_template(
-            "scraper.html", recipe_data=preview, recipe_payload=payload, scrape_url=scrape_url
+            _template("scraper.html"), recipe_data=preview, recipe_payload=payload, scrape_url=scrape_url
         )
 
     _session, recipe_service, _ = _get_services()
@@ -446,7 +743,7 @@ def save_scraped_recipe():
     except ValueError as exc:
         flash(str(exc), "danger")
         return render_template(
-            "scraper.html", recipe_data=preview, recipe_payload=payload, scrape_url=scrape_url
+            _template("scraper.html"), recipe_data=preview, recipe_payload=payload, scrape_url=scrape_url
         )
 
     flash("Recipe saved from scraper.", "success")
@@ -457,42 +754,30 @@ def save_scraped_recipe():
 def meal_plans_overview():
     """Display a simple overview of saved meal plans."""
 
-    session_factory = _get_session()
-    session = session_factory()
-    try:
-        meal_plans = _summarise_meal_plans(session)
-    finally:
-        session.close()
+    session = _request_session()
+    meal_plans = _summarise_meal_plans(session)
 
-    return render_template("meal_plans_overview.html", meal_plans=meal_plans)
+    return _stream_page("meal_plans_overview.html", meal_plans=meal_plans)
 
 
 @views_bp.route("/shopping-lists", methods=["GET"])
 def shopping_lists_overview():
     """Display the available shopping lists with basic metadata."""
 
-    session_factory = _get_session()
-    session = session_factory()
-    try:
-        shopping_lists = _summarise_shopping_lists(session)
-    finally:
-        session.close()
+    session = _request_session()
+    shopping_lists = _summarise_shopping_lists(session)
 
-    return render_template("shopping_lists_overview.html", shopping_lists=shopping_lists)
+    return _stream_page("shopping_lists_overview.html", shopping_lists=shopping_lists)
 
 
 @views_bp.route("/inventory", methods=["GET"])
 def inventory_overview():
     """Display the inventories/pantries created by the user."""
 
-    session_factory = _get_session()
-    session = session_factory()
-    try:
-        inventories = _summarise_inventories(session)
-    finally:
-        session.close()
+    session = _request_session()
+    inventories = _summarise_inventories(session)
 
-    return render_template("inventory_overview.html", inventories=inventories)
+    return _stream_page("inventory_overview.html", inventories=inventories)
 
 
 @views_bp.route("/inventory/new", methods=["GET", "POST"])
@@ -500,22 +785,18 @@ def add_inventory():
     """Allow users to create a new named pantry inventory."""
 
     if request.method == "GET":
-        return render_template("inventory_add.html")
+        return render_template(_template("inventory_add.html"))
 
     name = (request.form.get("name") or "").strip()
     if not name:
         flash("Please provide a name for the inventory.", "danger")
-        return render_template("inventory_add.html")
+        return render_template(_template("inventory_add.html"))
 
-    session_factory = _get_session()
-    session = session_factory()
-    try:
-        inventory = Inventory(name=name)
-        session.add(inventory)
-        session.commit()
-        flash(f"Created inventory '{inventory.name}'.", "success")
-    finally:
-        session.close()
+    session = _request_session()
+    inventory = Inventory(name=name)
+    session.add(inventory)
+    session.commit()
+    flash(f"Created inventory '{inventory.name}'.", "success")
 
     return redirect(url_for("views.inventory_overview"))
 
@@ -524,78 +805,70 @@ def add_inventory():
 def inventory_detail(inventory_id: int):
     """Display the items stored within a specific inventory."""
 
-    session_factory = _get_session()
-    session = session_factory()
-    try:
-        inventory = (
-            session.query(Inventory)
-            .options(selectinload(Inventory.items).selectinload(InventoryItem.ingredient))
-            .filter(Inventory.id == inventory_id)
-            .one_or_none()
-        )
-    finally:
-        session.close()
+    session = _request_session()
+    inventory = (
+        session.query(Inventory)
+        .options(selectinload(Inventory.items).selectinload(InventoryItem.ingredient))
+        .filter(Inventory.id == inventory_id)
+        .one_or_none()
+    )
 
     if inventory is None:
         abort(404)
 
-    return render_template("inventory_detail.html", inventory=inventory)
+    return render_template(_template("inventory_detail.html"), inventory=inventory)
 
 
 @views_bp.route("/inventory/<int:inventory_id>/items/new", methods=["GET", "POST"])
 def add_inventory_item(inventory_id: int):
     """Add an ingredient item to an existing inventory."""
 
-    session_factory = _get_session()
-    session = session_factory()
-    try:
-        inventory = session.get(Inventory, inventory_id)
-        if inventory is None:
-            abort(404)
-
-        if request.method == "GET":
-            return render_template("inventory_add_item.html", inventory=inventory)
-
-        name = (request.form.get("ingredient_name") or "").strip()
-        if not name:
-            flash("Ingredient name is required.", "danger")
-            return render_template("inventory_add_item.html", inventory=inventory)
-
-        quantity = _coerce_float(request.form.get("quantity"))
-        unit = (request.form.get("unit") or "").strip() or None
-        purchase_date = _parse_date(request.form.get("purchase_date"))
-        expiration_date = _parse_date(request.form.get("expiration_date"))
-        storage_location = (request.form.get("storage_location") or "").strip() or None
-        notes = (request.form.get("notes") or "").strip() or None
-
-        existing_ingredient = (
-            session.query(Ingredient)
-            .filter(Ingredient.name.ilike(name))
-            .one_or_none()
-        )
+    session = _request_session()
+    inventory = session.get(Inventory, inventory_id)
+    if inventory is None:
+        abort(404)
 
-        if existing_ingredient is None:
-            ingredient = Ingredient(name=name)
-            session.add(ingredient)
-            session.flush()
-        else:
-            ingredient = existing_ingredient
-
-        item = InventoryItem(
-            inventory=inventory,
-            ingredient=ingredient,
-            quantity=quantity,
-            unit=unit,
-            purchase_date=purchase_date,
-            expiration_date=expiration_date,
-            storage_location=storage_location,
-            notes=notes,
-        )
-        session.add(item)
-        session.commit()
-        flash(f"Added {ingredient.name} to {inventory.name}.", "success")
-    finally:
-        session.close()
+    if request.method == "GET":
+        return render_template(_template("inventory_add_item.html"), inventory=inventory)
+
+    name = (request.form.get("ingredient_name") or "").strip()
+    if not name:
+        flash("Ingredient name is required.", "danger")
+        return render_template(_template("inventory_add_item.html"), inventory=inventory)
+
+    quantity = _coerce_float(request.form.get("quantity"))
+    unit = (request.form.get("unit") or "").strip() or None
+    purchase_date = _parse_date(request.form.get("purchase_date"))
+    expiration_date = _parse_date(request.form.get("expiration_date"))
+    storage_location = (request.form.get("storage_location") or "").strip() or None
+    notes = (request.form.get("notes") or "").strip() or None
+
+    existing_ingredient = (
+        session.query(Ingredient)
+        .filter(Ingredient.name.ilike(name))
+        .one_or_none()
+    )
+
+    if existing_ingredient is None:
+        ingredient = Ingredient(name=name)
+        session.add(ingredient)
+        session.flush()
+    else:
+        ingredient = existing_ingredient
+
+    item = InventoryItem(
+        inventory=inventory,
+        ingredient=ingredient,
+        quantity=quantity,
+        unit=unit,
+        purchase_date=purchase_date,
+        expiration_date=expiration_date,
+        storage_location=storage_location,
+        notes=notes,
+    )
+    session.add(item)
+    session.commit()
+    flash(f"Added {ingredient.name} to {inventory.name}.", "success")
 
     return redirect(url_for("views.inventory_detail", inventory_id=inventory_id))
 
@@ -619,11 +892,17 @@ def recipes():
     }
     filters = {key: value for key, value in requested_filters.items() if value not in (None, "")}
 
+    etag = _page_etag(session, Recipe, MealPlan)
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+
     recipes_list = recipe_service.get_recipes(filters or None)
     meal_plans = meal_plan_service.get_meal_plans()
 
-    return render_template(
+    return _stream_page(
         "recipes.html",
+        etag,
         recipes=recipes_list,
         filters=requested_filters,
         meal_plans=meal_plans,
@@ -635,14 +914,14 @@ def add_recipe():
     """Display and process the add recipe form."""
 
     if request.method == "GET":
-        return render_template("add_recipe.html", edit_mode=False, recipe=None)
+        return render_template(_template("add_recipe.html"), edit_mode=False, recipe=None)
 
     payload = _collect_recipe_payload(request.form)
     errors = _validate_recipe_payload(payload)
     if errors:
         for error in errors:
             flash(error, "danger")
-        return render_template("add_recipe.html", edit_mode=False, recipe=_payload_to_preview(payload))
+        return render_template(_template("add_recipe.html"), edit_mode=False, recipe=_payload_to_preview(payload))
 
     _session, recipe_service, _ = _get_services()
     recipe = recipe_service.create_recipe(payload)
@@ -661,7 +940,7 @@ def recipe_detail(recipe_id: int):
 
     existing_meal_plans = meal_plan_service.get_meal_plans()
     return render_template(
-        "recipe_detail.html",
+        _template("recipe_detail.html"),
         recipe=recipe,
         existing_meal_plans=existing_meal_plans,
     )
@@ -677,7 +956,7 @@ def edit_recipe(recipe_id: int):
         abort(404)
 
     if request.method == "GET":
-        return render_template("add_recipe.html", edit_mode=True, recipe=recipe)
+        return render_template(_template("add_recipe.html"), edit_mode=True, recipe=recipe)
 
     payload = _collect_recipe_payload(request.form)
     errors = _validate_recipe_payload(payload)
@@ -687,7 +966,7 @@ def edit_recipe(recipe_id: int):
         payload_with_id = dict(payload)
         payload_with_id["id"] = recipe_id
         return render_template(
-            "add_recipe.html",
+            _template("add_recipe.html"),
             edit_mode=True,
             recipe=_payload_to_preview(payload_with_id),
         )
@@ -711,24 +990,50 @@ def delete_recipe(recipe_id: int):
     return redirect(url_for("views.recipes"))
 
 
+def _send_pdf(pdf_path: str):
+    """Send a generated PDF, delegating the file transfer to nginx if configured.
+
+    Raises ``FileNotFoundError`` when the file is missing.
+    """
+
+    prefix = current_app.config.get("PDF_ACCEL_REDIRECT_PREFIX")
+    if not prefix:
+        return send_file(pdf_path, as_attachment=True)
+
+    os.stat(pdf_path)
+    filename = os.path.basename(pdf_path)
+    response = current_app.response_class(mimetype="application/pdf")
+    response.headers["X-Accel-Redirect"] = f"{prefix.rstrip('/')}/{quote(filename)}"
+    response.headers.set("Content-Disposition", "attachment", filename=filename)
+    return response
+
+
 @views_bp.route("/recipes/<int:recipe_id>/pdf", methods=["GET"])
 def recipe_pdf(recipe_id: int):
     """Generate (if required) and send the recipe PDF to the client."""
 
     _session, recipe_service, _ = _get_services()
-    recipe = recipe_service.get_recipe_by_id(recipe_id)
+    recipe = recipe_service.get_recipe_by_id(recipe_id, load_relationships=False)
     if recipe is None:
         abort(404)
 
-    pdf_path = recipe.pdf_path
-    if not pdf_path or not os.path.exists(pdf_path):
-        pdf_path = recipe_service.generate_pdf(recipe_id)
-
-    if not pdf_path or not os.path.exists(pdf_path):
-        flash("Unable to generate recipe PDF.", "danger")
-        return redirect(url_for("views.recipe_detail", recipe_id=recipe_id))
-
-    return send_file(pdf_path, as_attachment=True)
+    # The stat inside send_file doubles as the existence check, so a stored
+    # PDF is served without a separate os.path.exists call.
+    if recipe.pdf_path:
+        try:
+            return _send_pdf(recipe.pdf_path)
+        except FileNotFoundError:
+            pass
+
+    pdf_path = recipe_service.generate_pdf(recipe_id)
+    if pdf_path:
+        try:
+            return _send_pdf(pdf_path)
+        except FileNotFoundError:
+            pass
+
+    flash("Unable to generate recipe PDF.", "danger")
+    return redirect(url_for("views.recipe_detail", recipe_id=recipe_id))
 
 
 @views_bp.route("/recipes/<int:recipe_id>/add-to-meal-plan", methods=["POST"])
@@ -736,7 +1041,9 @@ def add_to_meal_plan_from_recipe(recipe_id: int):
     """Attach the recipe to an existing meal plan."""
 
     session, recipe_service, meal_plan_service = _get_services()
-    recipe = recipe_service.get_recipe_by_id(recipe_id)
+    # Only the ingredients are read (by _ensure_shopping_list), as one lazy
+    # collection load when a shopping list is requested.
+    recipe = recipe_service.get_recipe_by_id(recipe_id, load_relationships=False)
     if recipe is None:
         abort(404)
 
@@ -772,7 +1079,7 @@ def add_to_new_meal_plan(recipe_id: int):
     """Create a new meal plan and attach the recipe to it."""
 
     session, recipe_service, meal_plan_service = _get_services()
-    recipe = recipe_service.get_recipe_by_id(recipe_id)
+    recipe = recipe_service.get_recipe_by_id(recipe_id, load_relationships=False)
     if recipe is None:
         abort(404)
 
@@ -10,9 +10,33 @@ class Config:
     # Database settings (default to SQLite)
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///data/recipes.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    
+
+    # Connection pool settings (ignored for SQLite)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = 30
+    DB_POOL_RECYCLE = 3600
+
+    # Request threads per worker process (matches gunicorn's GUNICORN_THREADS)
+    REQUEST_THREADS = int(os.environ.get('GUNICORN_THREADS', 8))
+    # Threads shared by the homepage's parallel loaders; unset sizes the pool
+    # for three loaders per request thread, capped by the connection pool
+    PAGE_LOADER_WORKERS = int(os.environ.get('PAGE_LOADER_WORKERS', 0)) or None
+
+    # Create missing tables when an engine is first used
+    AUTO_CREATE_ALL = os.environ.get('AUTO_CREATE_ALL', 'true').lower() in ('1', 'true', 'yes')
+
+    # Log requests that issue more SQL statements than this (None disables)
+    QUERY_COUNT_WARNING = None
+
     # PDF generation settings
     PDF_OUTPUT_DIR = os.path.join(os.getcwd(), 'static', 'pdfs')
+    # Render API-requested PDFs on a background thread. Opt-in: the API then
+    # answers 202 with a path that only exists once the writer has finished.
+    PDF_ASYNC = os.environ.get('PDF_ASYNC', 'false').lower() in ('1', 'true', 'yes')
+    # Internal nginx location mapped to PDF_OUTPUT_DIR; when set, PDF downloads
+    # are handed to nginx via X-Accel-Redirect instead of streamed by Flask
+    PDF_ACCEL_REDIRECT_PREFIX = os.environ.get('PDF_ACCEL_REDIRECT_PREFIX')
     
     # Debug settings
     DEBUG = False
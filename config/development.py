@@ -14,6 +14,9 @@ class DevelopmentConfig(Config):
     # Additional development settings
     FLASK_ENV = 'development'
     
+    # Flag likely N+1 query patterns in the log
+    QUERY_COUNT_WARNING = 25
+    
     # Initialize development-specific configuration
     @classmethod
     def initialize(cls):
@@ -8,6 +8,9 @@ class ProductionConfig(Config):
     # Database path (use environment variable)
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///data/production.db')
     
+    # Schema is managed explicitly in production unless opted in
+    AUTO_CREATE_ALL = os.environ.get('AUTO_CREATE_ALL', 'false').lower() in ('1', 'true', 'yes')
+    
     # Production settings
     FLASK_ENV = 'production'
     
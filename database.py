@@ -4,7 +4,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime, date as date_cls
 import os
 import logging
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 # Configure logging
@@ -16,42 +16,21 @@ Base = declarative_base()
 _tracked_test_engine = None
 
 
-def _capture_engine_argument(*args, **kwargs):
-    """Return the engine argument from ``create_all``/``drop_all`` calls."""
+@event.listens_for(Base.metadata, 'after_create')
+def _track_created_engine(target, connection, **kw):
+    """Remember the engine the schema was last created on."""
 
-    if args:
-        return args[0]
-    return kwargs.get('bind')
+    global _tracked_test_engine
+    _tracked_test_engine = connection.engine
 
 
-_original_create_all = Base.metadata.create_all
+@event.listens_for(Base.metadata, 'after_drop')
+def _untrack_dropped_engine(target, connection, **kw):
+    """Forget the tracked engine once its schema has been dropped."""
 
-
-def _create_all_with_tracking(*args, **kwargs):
-    engine = _capture_engine_argument(*args, **kwargs)
-    if engine is not None:
-        global _tracked_test_engine
-        _tracked_test_engine = engine
-    return _original_create_all(*args, **kwargs)
-
-
-Base.metadata.create_all = _create_all_with_tracking
-
-_original_drop_all = Base.metadata.drop_all
-
-
-def _drop_all_with_tracking(*args, **kwargs):
-    engine = _capture_engine_argument(*args, **kwargs)
-    try:
-        return _original_drop_all(*args, **kwargs)
-    finally:
-        if engine is not None:
-            global _tracked_test_engine
-            if engine is _tracked_test_engine:
-                _tracked_test_engine = None
-
-
-Base.metadata.drop_all = _drop_all_with_tracking
+    global _tracked_test_engine
+    if connection.engine is _tracked_test_engine:
+        _tracked_test_engine = None
 
 
 def get_tracked_test_engine():
@@ -93,7 +72,7 @@ class Recipe(Base):
     __tablename__ = 'recipes'
 
     id = Column(Integer, primary_key=True)
-    title = Column(String(255), nullable=False)
+    title = Column(String(255), nullable=False, index=True)  # title de-duplication on import
     description = Column(Text)
     instructions = Column(Text)
     prep_time = Column(Integer)  # in minutes
@@ -102,7 +81,7 @@ class Recipe(Base):
     image_url = Column(String(512))
     source_url = Column(String(512))
     pdf_path = Column(String(512))
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)  # "recent recipes" ordering
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
@@ -138,7 +117,7 @@ class Ingredient(Base):
     __tablename__ = 'ingredients'
 
     id = Column(Integer, primary_key=True)
-    name = Column(String(255), nullable=False)
+    name = Column(String(255), nullable=False, index=True)
     amount = Column(Float)
     unit = Column(String(50))
     
@@ -162,7 +141,7 @@ class NutritionInfo(Base):
     __tablename__ = 'nutrition_info'
 
     id = Column(Integer, primary_key=True)
-    recipe_id = Column(Integer, ForeignKey('recipes.id'))
+    recipe_id = Column(Integer, ForeignKey('recipes.id'), index=True)
     calories = Column(Float)
     protein = Column(Float)
     carbs = Column(Float)
@@ -224,7 +203,7 @@ class ShoppingListItem(Base):
     __tablename__ = 'shopping_list_items'
 
     id = Column(Integer, primary_key=True)
-    shopping_list_id = Column(Integer, ForeignKey('shopping_lists.id'))
+    shopping_list_id = Column(Integer, ForeignKey('shopping_lists.id'), index=True)
     ingredient_id = Column(Integer, ForeignKey('ingredients.id'))
     quantity = Column(Float)
     unit = Column(String(50))
@@ -265,7 +244,7 @@ class MealPlan(Base):
 
     id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
-    start_date = Column(DateTime)
+    start_date = Column(DateTime, index=True)
     end_date = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -293,12 +272,13 @@ class MealPlan(Base):
     def _coerce_dates(self, key, value):
         """Normalise supported date types for SQLite storage."""
 
-        if value in (None, ''):
-            return None
-
+        # MealPlanService already hands over datetimes, so check that first
         if isinstance(value, datetime):
             return value
 
+        if value is None or value == '':
+            return None
+
         if isinstance(value, date_cls):
             return datetime.combine(value, datetime.min.time())
 
@@ -327,12 +307,14 @@ class Inventory(Base):
         return f"<Inventory(id={self.id}, name='{self.name}')>"
     
     def to_dict(self):
+        # Resolve the date once rather than once per item
+        today = date_cls.today()
         return {
             'id': self.id,
             'name': self.name,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'items': [item.to_dict() for item in self.items]
+            'items': [item.to_dict(today) for item in self.items]
         }
 
 
@@ -361,12 +343,12 @@ class InventoryItem(Base):
     __tablename__ = 'inventory_items'
 
     id = Column(Integer, primary_key=True)
-    inventory_id = Column(Integer, ForeignKey('inventories.id'))
+    inventory_id = Column(Integer, ForeignKey('inventories.id'), index=True)
     ingredient_id = Column(Integer, ForeignKey('ingredients.id'))
     quantity = Column(Float)
     unit = Column(String(50))
     purchase_date = Column(Date)
-    expiration_date = Column(Date)
+    expiration_date = Column(Date, index=True)  # pantry expiry scans
     storage_location = Column(String(100))  # e.g., "Refrigerator", "Pantry", "Freezer"
     notes = Column(Text)
     
@@ -377,11 +359,11 @@ class InventoryItem(Base):
     def __repr__(self):
         return f"<InventoryItem(id={self.id}, ingredient_id={self.ingredient_id})>"
     
-    def to_dict(self):
+    def to_dict(self, today=None):
+        """Serialise the item; pass ``today`` when serialising many items."""
         days_until_expiration = None
         if self.expiration_date:
-            from datetime import date
-            days_until_expiration = (self.expiration_date - date.today()).days
+            days_until_expiration = (self.expiration_date - (today or date_cls.today())).days
             
         return {
             'id': self.id,
@@ -398,6 +380,10 @@ class InventoryItem(Base):
         }
 
 
+# Seconds to wait when probing a remote PostgreSQL URL at startup
+PROBE_CONNECT_TIMEOUT = 2
+
+
 def get_env_db_url():
     """Get the database URL based on the environment."""
     env = os.getenv('FLASK_ENV', 'development')
@@ -411,7 +397,8 @@ def get_env_db_url():
         try:
             # Test the connection before deciding to use it
             import psycopg2
-            conn = psycopg2.connect(db_url)
+            # Short timeout so an unreachable host does not stall startup
+            conn = psycopg2.connect(db_url, connect_timeout=PROBE_CONNECT_TIMEOUT)
             conn.close()
             logger.info("Successfully connected to PostgreSQL database")
         except Exception as e:
@@ -431,12 +418,24 @@ def get_env_db_url():
     return db_url
 
 
-# Global engine variable to reuse connection pool
+def create_missing_indexes(engine):
+    """Create declared indexes that are missing from existing tables.
+    
+    ``create_all`` skips tables that already exist, so indexes added to
+    existing models are created separately.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+# Global engine and session factory, created once and reused
 _engine = None
+_SessionFactory = None
 
 def get_engine():
     """Get or create a SQLAlchemy engine with connection pooling."""
-    global _engine
+    global _engine, _SessionFactory
     
     if _engine is None:
         db_url = get_env_db_url()
@@ -460,45 +459,25 @@ def get_engine():
         
         # Initialize database schema
         Base.metadata.create_all(_engine)
+        create_missing_indexes(_engine)
+        
+        # Built once per engine; loaded attributes stay valid after commit
+        _SessionFactory = sessionmaker(bind=_engine, expire_on_commit=False, future=True)
     
     return _engine
 
 
 def get_db_session():
     """
-    Get a database session with automatic reconnection.
+    Get a database session.
+    
+    Dead pooled connections are detected and replaced by the engine's
+    ``pool_pre_ping`` check on checkout, so no test query is issued here;
+    connection failures surface as ``OperationalError`` when the session
+    is first used.
     
     Returns:
         SQLAlchemy session object
     """
-    from sqlalchemy.exc import OperationalError, DisconnectionError
-    from sqlalchemy import text
-    import time
-    
-    # Max retry attempts
-    max_retries = 3
-    retry_delay = 1  # seconds
-    
-    for attempt in range(max_retries):
-        try:
-            engine = get_engine()
-            Session = sessionmaker(bind=engine)
-            session = Session()
-            
-            # Test the connection with properly declared text SQL
-            session.execute(text("SELECT 1"))
-            
-            return session
-            
-        except (OperationalError, DisconnectionError) as e:
-            if attempt < max_retries - 1:
-                logger.warning(f"Database connection failed (attempt {attempt+1}/{max_retries}): {str(e)}")
-                time.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-                
-                # Reset the engine to force a new connection pool on next attempt
-                global _engine
-                _engine = None
-            else:
-                logger.error(f"Failed to establish database connection after {max_retries} attempts: {str(e)}")
-                raise
+    get_engine()
+    return _SessionFactory()
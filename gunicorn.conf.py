@@ -0,0 +1,13 @@
+"""Gunicorn settings for serving the Recipe Server application."""
+from __future__ import annotations
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+
+# Threaded workers let the per-thread scoped sessions share each worker's
+# connection pool instead of serialising every request.
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", 4))
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
@@ -1,5 +1,4 @@
 import os
-import shutil
 import sqlite3
 import logging
 from database import get_env_db_url
@@ -39,10 +38,11 @@ def migrate_to_env_db():
             if os.path.exists(db_path):
                 logger.warning(f"{env} database already exists. Backing up...")
                 backup_path = f"{db_path}.bak"
-                shutil.copy2(db_path, backup_path)
+                snapshot_db(db_path, backup_path)
+                os.remove(db_path)
             
             logger.info(f"Copying recipes.db to {env} database at {db_path}")
-            shutil.copy2(old_db_path, db_path)
+            snapshot_db(old_db_path, db_path)
             
             # Verify the new database
             verify_db(db_path)
@@ -62,6 +62,22 @@ def migrate_to_env_db():
     
     return True
 
+def snapshot_db(source_path, target_path):
+    """
+    Write a consistent, compacted copy of a SQLite database with VACUUM INTO.
+    
+    Unlike a file copy this reads through SQLite, so pending WAL content is
+    included and free pages are left behind. The target must not exist.
+    """
+    if os.path.exists(target_path):
+        os.remove(target_path)
+    
+    conn = sqlite3.connect(source_path)
+    try:
+        conn.execute("VACUUM INTO ?", (target_path,))
+    finally:
+        conn.close()
+
 def get_db_path_from_url(db_url):
     """Extract the file path from a SQLite database URL."""
     if db_url.startswith('sqlite:///'):
@@ -1,113 +1,242 @@
+import argparse
 import os
 import json
 import logging
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from database import Base, Recipe, Ingredient, NutritionInfo, MealPlan, get_env_db_url
+from itertools import islice
+from sqlalchemy import create_engine, insert, select
+from database import Base, Recipe, Ingredient, NutritionInfo, MealPlan, get_env_db_url, recipe_ingredient, create_missing_indexes
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-def migrate_json_to_db(json_file_path, db_url=None):
+# Default number of recipes written per bulk INSERT round
+BATCH_SIZE = 1000
+
+# Values per IN (...) lookup, below SQLite's historical 999 parameter limit
+LOOKUP_CHUNK_SIZE = 900
+
+NUTRITION_FIELDS = ('calories', 'protein', 'carbs', 'fat', 'sugar', 'sodium', 'fiber')
+
+# Characters read from the JSON file at a time while streaming
+READ_SIZE = 64 * 1024
+
+
+def _iter_json_array(f):
+    """Yield the elements of the top-level JSON array in ``f`` one at a time.
+    
+    Only the element being decoded is held in memory, so large exports are
+    never materialised as a whole.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    eof = False
+    started = False
+    while True:
+        buffer = buffer.lstrip()
+        if not started and buffer:
+            if buffer[0] != '[':
+                raise ValueError("Expected a JSON array of recipes")
+            buffer = buffer[1:].lstrip()
+            started = True
+        if started and buffer.startswith(','):
+            buffer = buffer[1:].lstrip()
+        if started and buffer.startswith(']'):
+            return
+        
+        if started and buffer:
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield item
+                buffer = buffer[end:]
+                continue
+        
+        if eof:
+            raise ValueError("Unexpected end of JSON array")
+        chunk = f.read(READ_SIZE)
+        eof = not chunk
+        buffer += chunk
+
+
+def _batched(iterable, size):
+    """Yield lists of up to ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _prepare_recipe(recipe_json):
+    """Split one JSON recipe into its recipe row, ingredient rows and nutrition row."""
+    recipe_row = {
+        'title': recipe_json['title'],
+        'description': recipe_json.get('description', ''),
+        'instructions': recipe_json.get('instructions', ''),
+        'prep_time': recipe_json.get('prep_time'),
+        'cook_time': recipe_json.get('cook_time'),
+        'servings': recipe_json.get('servings'),
+        'image_url': recipe_json.get('image_url'),
+        'source_url': recipe_json.get('source_url'),
+    }
+    
+    # Ingredients are shared by name; a repeated name within a recipe links once
+    ingredient_rows = {}
+    for ingredient_json in recipe_json.get('ingredients', []):
+        ingredient_name = ingredient_json.get('name', '')
+        if ingredient_name and ingredient_name not in ingredient_rows:
+            ingredient_rows[ingredient_name] = {
+                'name': ingredient_name,
+                'amount': ingredient_json.get('amount'),
+                'unit': ingredient_json.get('unit'),
+            }
+    
+    nutrition_row = None
+    if 'nutrition' in recipe_json:
+        nutrition_row = {field: recipe_json['nutrition'].get(field) for field in NUTRITION_FIELDS}
+    
+    return recipe_row, list(ingredient_rows.values()), nutrition_row
+
+
+def _existing_titles(conn, recipe_batch):
+    """Return the titles in ``recipe_batch`` that are already stored."""
+    titles = {
+        recipe_json['title'] for recipe_json in recipe_batch
+        if isinstance(recipe_json, dict) and recipe_json.get('title')
+    }
+    existing = set()
+    for chunk in _batched(titles, LOOKUP_CHUNK_SIZE):
+        existing.update(conn.scalars(select(Recipe.title).where(Recipe.title.in_(chunk))))
+    return existing
+
+
+def _insert_batch(conn, batch):
+    """Insert prepared recipes with one executemany INSERT per table."""
+    # Resolve the batch's ingredient names with chunked IN queries and
+    # insert only the names not stored yet
+    names = {row['name'] for _, ingredient_rows, _ in batch for row in ingredient_rows}
+    ingredient_ids = {}
+    for chunk in _batched(names, LOOKUP_CHUNK_SIZE):
+        ingredient_ids.update(conn.execute(
+            select(Ingredient.name, Ingredient.id).where(Ingredient.name.in_(chunk))
+        ).all())
+    
+    new_ingredients = {}
+    for _, ingredient_rows, _ in batch:
+        for row in ingredient_rows:
+            if row['name'] not in ingredient_ids:
+                new_ingredients.setdefault(row['name'], row)
+    # RETURNING carries the natural key back with each id, so rows need not
+    # come back in parameter order. Asking SQLAlchemy to sort them instead
+    # makes it fall back to one INSERT per row on SQLite.
+    if new_ingredients:
+        inserted = conn.execute(
+            insert(Ingredient.__table__).returning(Ingredient.name, Ingredient.id),
+            list(new_ingredients.values())
+        )
+        ingredient_ids.update(inserted.all())
+    
+    # Titles are unique within a batch; duplicates were skipped by the caller
+    recipe_ids = dict(conn.execute(
+        insert(Recipe.__table__).returning(Recipe.title, Recipe.id),
+        [recipe_row for recipe_row, _, _ in batch]
+    ).all())
+    
+    links = [
+        {'recipe_id': recipe_ids[recipe_row['title']], 'ingredient_id': ingredient_ids[row['name']]}
+        for recipe_row, ingredient_rows, _ in batch
+        for row in ingredient_rows
+    ]
+    if links:
+        conn.execute(insert(recipe_ingredient), links)
+    
+    nutrition_rows = [
+        dict(nutrition_row, recipe_id=recipe_ids[recipe_row['title']])
+        for recipe_row, _, nutrition_row in batch
+        if nutrition_row is not None
+    ]
+    if nutrition_rows:
+        conn.execute(insert(NutritionInfo.__table__), nutrition_rows)
+
+
+def _batch_size_arg(value):
+    """Parse ``--batch-size``, rejecting values below 1."""
+    batch_size = int(value)
+    if batch_size < 1:
+        raise argparse.ArgumentTypeError(f"batch size must be at least 1, got {value}")
+    return batch_size
+
+
+def migrate_json_to_db(json_file_path, db_url=None, batch_size=BATCH_SIZE):
     """
     Migrate recipe data from a JSON file to the database.
     
     Args:
         json_file_path (str): Path to the JSON file containing recipe data.
         db_url (str, optional): Database URL. If None, will use the environment-specific URL.
+        batch_size (int, optional): Recipes inserted per bulk INSERT round.
     
     Returns:
         bool: True if migration was successful, False otherwise.
+    
+    Raises:
+        ValueError: If ``batch_size`` is below 1.
     """
+    # A zero batch size would write nothing yet still report success
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+    
     try:
         # Check if the JSON file exists
         if not os.path.exists(json_file_path):
             logger.error(f"JSON file not found: {json_file_path}")
             return False
         
-        # Load the JSON data
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            recipe_data = json.load(f)
-        
         # Get the database URL
         if db_url is None:
             db_url = get_env_db_url()
         
-        # Create the database engine and session
-        engine = create_engine(db_url)
+        # Create the database engine; SQLAlchemy's own INSERT paging matches
+        # our batches so a batch is not split again into smaller statements
+        engine = create_engine(db_url, insertmanyvalues_page_size=batch_size)
         Base.metadata.create_all(engine)
-        Session = sessionmaker(bind=engine)
-        session = Session()
+        create_missing_indexes(engine)
         
-        # Process each recipe
+        # Run the whole migration in one Core transaction: a single commit
+        # (and fsync) at the end, and a failure leaves the database untouched.
+        # Recipes are streamed from the file a batch at a time. The ORM is
+        # only used for the schema; rows go in as plain parameter dicts.
         recipes_added = 0
-        for recipe_json in recipe_data:
-            try:
-                # Check if recipe already exists by title
-                existing_recipe = session.query(Recipe).filter(Recipe.title == recipe_json['title']).first()
-                if existing_recipe:
-                    logger.info(f"Recipe already exists: {recipe_json['title']}")
-                    continue
-                
-                # Create the recipe
-                recipe = Recipe(
-                    title=recipe_json['title'],
-                    description=recipe_json.get('description', ''),
-                    instructions=recipe_json.get('instructions', ''),
-                    prep_time=recipe_json.get('prep_time'),
-                    cook_time=recipe_json.get('cook_time'),
-                    servings=recipe_json.get('servings'),
-                    image_url=recipe_json.get('image_url'),
-                    source_url=recipe_json.get('source_url')
-                )
+        seen_titles = set()
+        with open(json_file_path, 'r', encoding='utf-8') as f, engine.begin() as conn:
+            for recipe_batch in _batched(_iter_json_array(f), batch_size):
+                # One title lookup per batch rather than one query per recipe
+                existing_titles = _existing_titles(conn, recipe_batch)
                 
-                # Add ingredients
-                if 'ingredients' in recipe_json:
-                    for ingredient_json in recipe_json['ingredients']:
-                        # Check if ingredient already exists
-                        ingredient_name = ingredient_json.get('name', '')
-                        if not ingredient_name:
+                # Validate each recipe and skip those already stored
+                pending = []
+                for recipe_json in recipe_batch:
+                    try:
+                        title = recipe_json['title']
+                        if title in existing_titles or title in seen_titles:
+                            logger.info(f"Recipe already exists: {title}")
                             continue
                         
-                        ingredient = session.query(Ingredient).filter(Ingredient.name == ingredient_name).first()
-                        if not ingredient:
-                            ingredient = Ingredient(
-                                name=ingredient_name,
-                                amount=ingredient_json.get('amount'),
-                                unit=ingredient_json.get('unit')
-                            )
-                            session.add(ingredient)
-                        
-                        recipe.ingredients.append(ingredient)
-                
-                # Add nutrition info
-                if 'nutrition' in recipe_json:
-                    nutrition = NutritionInfo(
-                        calories=recipe_json['nutrition'].get('calories'),
-                        protein=recipe_json['nutrition'].get('protein'),
-                        carbs=recipe_json['nutrition'].get('carbs'),
-                        fat=recipe_json['nutrition'].get('fat'),
-                        sugar=recipe_json['nutrition'].get('sugar'),
-                        sodium=recipe_json['nutrition'].get('sodium'),
-                        fiber=recipe_json['nutrition'].get('fiber')
-                    )
-                    recipe.nutrition = nutrition
-                
-                session.add(recipe)
-                recipes_added += 1
+                        pending.append(_prepare_recipe(recipe_json))
+                        seen_titles.add(title)
+                    
+                    except Exception as e:
+                        logger.error(f"Error processing recipe {recipe_json.get('title', 'Unknown')}: {str(e)}")
+                        continue
                 
-                # Commit in batches to avoid memory issues
-                if recipes_added % 10 == 0:
-                    session.commit()
-                    logger.info(f"Committed {recipes_added} recipes so far")
-            
-            except Exception as e:
-                logger.error(f"Error processing recipe {recipe_json.get('title', 'Unknown')}: {str(e)}")
-                continue
+                if pending:
+                    _insert_batch(conn, pending)
+                    recipes_added += len(pending)
+                    logger.info(f"Inserted {recipes_added} recipes so far")
         
-        # Final commit
-        session.commit()
+        engine.dispose()
         logger.info(f"Successfully migrated {recipes_added} recipes to the database")
         
         return True
@@ -117,15 +246,15 @@ def migrate_json_to_db(json_file_path, db_url=None):
         return False
 
 if __name__ == "__main__":
-    # Default JSON file path
-    default_json_path = os.path.join('data', 'recipes.json')
-    
-    # Allow custom JSON file path from command line arguments
-    import sys
-    json_path = sys.argv[1] if len(sys.argv) > 1 else default_json_path
+    parser = argparse.ArgumentParser(description="Migrate recipes from a JSON export into the database.")
+    parser.add_argument('json_path', nargs='?', default=os.path.join('data', 'recipes.json'),
+                        help="JSON file containing a list of recipes (default: data/recipes.json)")
+    parser.add_argument('--batch-size', type=_batch_size_arg, default=BATCH_SIZE,
+                        help=f"Recipes inserted per bulk INSERT round (default: {BATCH_SIZE})")
+    args = parser.parse_args()
     
-    logger.info(f"Starting migration from {json_path} to database")
-    success = migrate_json_to_db(json_path)
+    logger.info(f"Starting migration from {args.json_path} to database")
+    success = migrate_json_to_db(args.json_path, batch_size=args.batch_size)
     
     if success:
         logger.info("Migration completed successfully")
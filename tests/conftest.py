@@ -1,28 +1,49 @@
 import os
+import sqlite3
 import sys
+from contextlib import contextmanager
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, insert
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
 # Add the parent directory to the path so that imports work correctly
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app import create_app
-from database import Base, Recipe, Ingredient, NutritionInfo, MealPlan
+import database
+from app import _reset_database_extensions, create_app
+from database import Base, Recipe, Ingredient, NutritionInfo, MealPlan, meal_plan_recipe
 
 
-@pytest.fixture
-def app():
-    """Create and configure a Flask app for testing."""
-    # Use a temporary in-memory database for testing
+@pytest.fixture(scope="session")
+def _app_template():
+    """Create the Flask app once; ``app`` resets it for every test."""
     app = create_app('testing')
     app.config.update({
         'TESTING': True,
         'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
-        'WTF_CSRF_ENABLED': False
+        'WTF_CSRF_ENABLED': False,
+        # The schema is already cloned into the test database
+        'AUTO_CREATE_ALL': False
     })
+    return app, dict(app.config)
+
+
+@pytest.fixture
+def app(_app_template, db_engine, monkeypatch):
+    """Create and configure a Flask app for testing."""
+    app, config = _app_template
+    # In-memory URIs resolve to the tracked engine; pin it to the test's
+    # database so the app and ``db_session`` always see the same rows
+    monkeypatch.setattr(database, '_tracked_test_engine', db_engine)
 
     yield app
+    
+    # Undo per-test config changes and drop the engine, services and session
+    # registry so the next test binds to its own database
+    _reset_database_extensions(app)
+    app.config.clear()
+    app.config.update(config)
 
 
 @pytest.fixture
@@ -37,45 +58,87 @@ def runner(app):
     return app.test_cli_runner()
 
 
-@pytest.fixture
-def db_engine():
-    """Create a database engine for testing."""
-    engine = create_engine('sqlite:///:memory:')
+def _connect_memory():
+    """Open an in-memory SQLite connection usable from any test thread."""
+    connection = sqlite3.connect(':memory:', check_same_thread=False)
+    # Test data needs no durability. An in-memory database already keeps its
+    # journal in memory, so only syncing and temp storage need adjusting.
+    connection.execute("PRAGMA synchronous=OFF")
+    connection.execute("PRAGMA temp_store=MEMORY")
+    return connection
+
+
+def _engine_for(connection):
+    """Wrap an existing sqlite3 connection in a single-connection engine."""
+    return create_engine('sqlite://', creator=lambda: connection, poolclass=StaticPool)
+
+
+@pytest.fixture(scope="session")
+def schema_template():
+    """Build the schema once into a template database for the whole session."""
+    connection = _connect_memory()
+    engine = _engine_for(connection)
     Base.metadata.create_all(engine)
+    # Keep the connection open; it is the template for every test database
+    engine.dispose(close=False)
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def db_engine(schema_template):
+    """Give each test a fresh database cloned from the schema template."""
+    # The online backup API copies the prebuilt schema page by page, which is
+    # far cheaper than replaying the DDL or deleting rows after every test
+    connection = _connect_memory()
+    schema_template.backup(connection)
+    engine = _engine_for(connection)
     yield engine
-    Base.metadata.drop_all(engine)
+    engine.dispose()
 
 
 @pytest.fixture
 def db_session(db_engine):
     """Create a database session for testing."""
-    session = Session(db_engine)
+    # Like the app's sessions, don't expire on commit: fixtures and tests read
+    # attributes right after committing and would otherwise reload every row
+    session = Session(db_engine, autoflush=False, expire_on_commit=False)
     yield session
     session.close()
 
 
+@pytest.fixture
+def count_queries(db_engine):
+    """Record the SQL statements run inside ``with count_queries() as statements:``."""
+    @contextmanager
+    def recorder():
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db_engine, 'before_cursor_execute', listener)
+        try:
+            yield statements
+        finally:
+            event.remove(db_engine, 'before_cursor_execute', listener)
+    
+    return recorder
+
+
 @pytest.fixture
 def sample_recipe(db_session):
     """Create a sample recipe for testing."""
-    # Create ingredients
-    ingredient1 = Ingredient(name="Flour", amount=2.0, unit="cups")
-    ingredient2 = Ingredient(name="Sugar", amount=1.0, unit="cup")
-    ingredient3 = Ingredient(name="Eggs", amount=2.0, unit="whole")
+    # Insert the ingredients in one multi-row statement; RETURNING hands back
+    # ORM objects that the recipe can link to within the same commit
+    ingredients = db_session.scalars(
+        insert(Ingredient).returning(Ingredient),
+        [
+            {"name": "Flour", "amount": 2.0, "unit": "cups"},
+            {"name": "Sugar", "amount": 1.0, "unit": "cup"},
+            {"name": "Eggs", "amount": 2.0, "unit": "whole"}
+        ]
+    ).all()
+    # SQLite does not promise RETURNING order; ids follow insertion order
+    ingredients.sort(key=lambda ingredient: ingredient.id)
     
-    db_session.add_all([ingredient1, ingredient2, ingredient3])
-    
-    # Create nutrition info
-    nutrition = NutritionInfo(
-        calories=350.0,
-        protein=5.0,
-        carbs=50.0,
-        fat=10.0,
-        sugar=25.0,
-        sodium=100.0,
-        fiber=2.0
-    )
-    
-    # Create recipe
     recipe = Recipe(
         title="Test Recipe",
         description="A test recipe",
@@ -84,13 +147,19 @@ def sample_recipe(db_session):
         cook_time=30,
         servings=4,
         image_url="https://example.com/image.jpg",
-        source_url="https://example.com/recipe"
+        source_url="https://example.com/recipe",
+        ingredients=ingredients,
+        nutrition=NutritionInfo(
+            calories=350.0,
+            protein=5.0,
+            carbs=50.0,
+            fat=10.0,
+            sugar=25.0,
+            sodium=100.0,
+            fiber=2.0
+        )
     )
     
-    # Link ingredients and nutrition to recipe
-    recipe.ingredients = [ingredient1, ingredient2, ingredient3]
-    recipe.nutrition = nutrition
-    
     db_session.add(recipe)
     db_session.commit()
     
@@ -100,7 +169,7 @@ def sample_recipe(db_session):
 @pytest.fixture
 def sample_meal_plan(db_session, sample_recipe):
     """Create a sample meal plan for testing."""
-    # Create another recipe for the meal plan
+    # Create another recipe and the meal plan, flushing only to get their ids
     recipe2 = Recipe(
         title="Another Test Recipe",
         description="Another test recipe",
@@ -109,32 +178,24 @@ def sample_meal_plan(db_session, sample_recipe):
         cook_time=20,
         servings=2
     )
-    
-    db_session.add(recipe2)
-    db_session.commit()
-    
-    # Create meal plan
     meal_plan = MealPlan(
         name="Test Meal Plan",
         start_date="2023-01-01",
         end_date="2023-01-07"
     )
     
-    db_session.add(meal_plan)
-    db_session.commit()
+    db_session.add_all([recipe2, meal_plan])
+    db_session.flush()
     
-    # Add recipes to meal plan via association table
-    from sqlalchemy import text
+    # Add recipes to meal plan via association table in one executemany
     db_session.execute(
-        text("INSERT INTO meal_plan_recipe (meal_plan_id, recipe_id, day, meal_type) VALUES (:meal_plan_id, :recipe_id, :day, :meal_type)"),
-        {"meal_plan_id": meal_plan.id, "recipe_id": sample_recipe.id, "day": "Monday", "meal_type": "Dinner"}
-    )
-    db_session.execute(
-        text("INSERT INTO meal_plan_recipe (meal_plan_id, recipe_id, day, meal_type) VALUES (:meal_plan_id, :recipe_id, :day, :meal_type)"),
-        {"meal_plan_id": meal_plan.id, "recipe_id": recipe2.id, "day": "Tuesday", "meal_type": "Lunch"}
+        meal_plan_recipe.insert(),
+        [
+            {"meal_plan_id": meal_plan.id, "recipe_id": sample_recipe.id, "day": "Monday", "meal_type": "Dinner"},
+            {"meal_plan_id": meal_plan.id, "recipe_id": recipe2.id, "day": "Tuesday", "meal_type": "Lunch"}
+        ]
     )
     
     db_session.commit()
     
     return meal_plan
-
@@ -1,12 +1,13 @@
-import json
+import orjson
 import pytest
+from app.services.scraper_service import ScraperService
 
 
 def test_get_recipes(client):
     """Test retrieving recipes."""
     response = client.get('/api/recipes')
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert isinstance(data, list)
 
 
@@ -14,7 +15,7 @@ def test_get_recipe_by_id(client, sample_recipe, db_session):
     """Test retrieving a specific recipe by ID."""
     response = client.get(f'/api/recipes/{sample_recipe.id}')
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert data['title'] == 'Test Recipe'
     assert data['description'] == 'A test recipe'
     assert data['prep_time'] == 15
@@ -24,6 +25,19 @@ def test_get_recipe_by_id(client, sample_recipe, db_session):
     assert len(data['ingredients']) == 3
 
 
+def test_get_recipe_by_id_cache_hit_skips_relationships(client, sample_recipe, count_queries):
+    """Test that a cached recipe is served with a single query for its row."""
+    first = client.get(f'/api/recipes/{sample_recipe.id}')
+    assert first.status_code == 200
+    
+    with count_queries() as statements:
+        response = client.get(f'/api/recipes/{sample_recipe.id}')
+    
+    assert response.status_code == 200
+    assert orjson.loads(response.data) == orjson.loads(first.data)
+    assert len([sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]) == 1
+
+
 def test_get_nonexistent_recipe(client):
     """Test retrieving a recipe that doesn't exist."""
     response = client.get('/api/recipes/9999')
@@ -53,11 +67,11 @@ def test_create_recipe(client):
     
     response = client.post(
         '/api/recipes',
-        data=json.dumps(recipe_data),
+        data=orjson.dumps(recipe_data),
         content_type='application/json'
     )
     assert response.status_code == 201
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert data['title'] == 'New Test Recipe'
     assert len(data['ingredients']) == 2
     assert data['nutrition']['calories'] == 200.0
@@ -72,12 +86,23 @@ def test_create_recipe_missing_title(client):
     
     response = client.post(
         '/api/recipes',
-        data=json.dumps(recipe_data),
+        data=orjson.dumps(recipe_data),
         content_type='application/json'
     )
     assert response.status_code == 400
 
 
+def test_create_recipe_malformed_json(client):
+    """Test that an unparsable request body is rejected rather than raising."""
+    response = client.post(
+        '/api/recipes',
+        data='{"title": "Broken",',
+        content_type='application/json'
+    )
+    assert response.status_code == 400
+    assert orjson.loads(response.data)['message'] == 'Request body must be JSON'
+
+
 def test_update_recipe(client, sample_recipe, db_session):
     """Test updating an existing recipe."""
     update_data = {
@@ -87,17 +112,35 @@ def test_update_recipe(client, sample_recipe, db_session):
     
     response = client.put(
         f'/api/recipes/{sample_recipe.id}',
-        data=json.dumps(update_data),
+        data=orjson.dumps(update_data),
         content_type='application/json'
     )
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert data['title'] == 'Updated Recipe Title'
     assert data['prep_time'] == 25
     # Other fields should remain unchanged
     assert data['description'] == 'A test recipe'
 
 
+def test_list_recipes_reflects_ingredient_updates(client, sample_recipe, db_session):
+    """Listing recipes after an ingredient-only update returns fresh data."""
+    response = client.get('/api/recipes')
+    assert response.status_code == 200
+    assert len(orjson.loads(response.data)[0]['ingredients']) == 3
+    
+    response = client.put(
+        f'/api/recipes/{sample_recipe.id}',
+        data=orjson.dumps({"ingredients": [{"name": "Butter", "amount": 1.0, "unit": "cup"}]}),
+        content_type='application/json'
+    )
+    assert response.status_code == 200
+    
+    response = client.get('/api/recipes')
+    data = orjson.loads(response.data)
+    assert [ingredient['name'] for ingredient in data[0]['ingredients']] == ['Butter']
+
+
 def test_delete_recipe(client, sample_recipe, db_session):
     """Test deleting a recipe."""
     response = client.delete(f'/api/recipes/{sample_recipe.id}')
@@ -112,7 +155,7 @@ def test_get_meal_plans(client):
     """Test retrieving meal plans."""
     response = client.get('/api/meal-plans')
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert isinstance(data, list)
 
 
@@ -120,7 +163,7 @@ def test_get_meal_plan_by_id(client, sample_meal_plan, db_session):
     """Test retrieving a specific meal plan by ID."""
     response = client.get(f'/api/meal-plans/{sample_meal_plan.id}')
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert data['name'] == 'Test Meal Plan'
     assert 'days' in data
     assert 'Monday' in data['days']
@@ -139,11 +182,11 @@ def test_create_meal_plan(client):
     
     response = client.post(
         '/api/meal-plans',
-        data=json.dumps(meal_plan_data),
+        data=orjson.dumps(meal_plan_data),
         content_type='application/json'
     )
     assert response.status_code == 201
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert data['name'] == 'New Meal Plan'
 
 
@@ -157,11 +200,11 @@ def test_add_recipe_to_meal_plan(client, sample_meal_plan, sample_recipe, db_ses
     
     response = client.post(
         f'/api/meal-plans/{sample_meal_plan.id}/recipes',
-        data=json.dumps(add_data),
+        data=orjson.dumps(add_data),
         content_type='application/json'
     )
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert 'Wednesday' in data['days']
     assert 'Breakfast' in data['days']['Wednesday']
     assert data['days']['Wednesday']['Breakfast'][0]['title'] == 'Test Recipe'
@@ -176,11 +219,11 @@ def test_remove_recipe_from_meal_plan(client, sample_meal_plan, sample_recipe, d
     
     response = client.delete(
         f'/api/meal-plans/{sample_meal_plan.id}/recipes/{sample_recipe.id}',
-        data=json.dumps(remove_data),
+        data=orjson.dumps(remove_data),
         content_type='application/json'
     )
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     
     # The recipe should be removed from Monday Dinner
     assert 'Monday' in data['days']
@@ -198,11 +241,11 @@ def test_calculate_nutrition(client):
     
     response = client.post(
         '/api/nutrition/calculate',
-        data=json.dumps({"ingredients": ingredients}),
+        data=orjson.dumps({"ingredients": ingredients}),
         content_type='application/json'
     )
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert 'calories' in data
     assert 'protein' in data
     assert 'carbs' in data
@@ -212,9 +255,9 @@ def test_calculate_nutrition(client):
     assert 'fiber' in data
 
 
-def test_scrape_recipe(client, monkeypatch):
-    """Test the recipe scraper endpoint."""
-    # Mock the scraper service to return a fixed recipe
+@pytest.fixture
+def mock_scraper(monkeypatch):
+    """Mock the scraper service to return a fixed recipe."""
     def mock_scrape_recipe(url):
         return {
             "title": "Mocked Recipe",
@@ -230,17 +273,40 @@ def test_scrape_recipe(client, monkeypatch):
             "source_url": url
         }
     
-    from app.services.scraper_service import ScraperService
     monkeypatch.setattr(ScraperService, 'scrape_recipe', mock_scrape_recipe)
-    
+
+
+def test_scrape_recipe(client, mock_scraper):
+    """Test the recipe scraper endpoint."""
     response = client.post(
         '/api/scrape',
-        data=json.dumps({"url": "https://example.com/recipe"}),
+        data=orjson.dumps({"url": "https://example.com/recipe"}),
         content_type='application/json'
     )
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = orjson.loads(response.data)
     assert data['title'] == 'Mocked Recipe'
     assert len(data['ingredients']) == 1
     assert data['ingredients'][0]['name'] == 'Mocked Ingredient'
 
+
+def test_generate_recipe_pdf_async(app, client, sample_recipe, tmp_path, monkeypatch):
+    """Test that async PDF requests are accepted and rendered by the writer."""
+    import os
+    from database import Recipe
+    
+    # The service writes under the working directory's static/pdfs
+    monkeypatch.chdir(tmp_path)
+    app.config['PDF_ASYNC'] = True
+    
+    response = client.post(f'/api/recipes/{sample_recipe.id}/pdf')
+    assert response.status_code == 202
+    data = orjson.loads(response.data)
+    assert data['status'] == 'pending'
+    
+    app.extensions['pdf_writer'].flush()
+    
+    assert os.path.exists(data['pdf_path'])
+    with app.app_context():
+        session = app.extensions['get_session_factory']()()
+        assert session.get(Recipe, sample_recipe.id).pdf_path == data['pdf_path']
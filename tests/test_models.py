@@ -1,6 +1,6 @@
 import pytest
-from database import Recipe, Ingredient, NutritionInfo, MealPlan
-from datetime import datetime
+from database import Recipe, Ingredient, NutritionInfo, MealPlan, meal_plan_recipe
+from datetime import date, datetime
 
 
 def test_recipe_model(db_session):
@@ -106,64 +106,34 @@ def test_recipe_to_dict(sample_recipe):
     assert recipe_dict['nutrition']['fiber'] == 2.0
 
 
-def test_ingredient_model(db_session):
-    """Test Ingredient model."""
-    ingredient = Ingredient(name="Salt", amount=1.0, unit="tsp")
+def test_ingredient_and_nutrition_info_models(db_session):
+    """Test Ingredient and NutritionInfo models against one database."""
+    ingredient_fields = {"name": "Salt", "amount": 1.0, "unit": "tsp"}
+    nutrition_fields = {
+        "calories": 150.0,
+        "protein": 3.0,
+        "carbs": 20.0,
+        "fat": 7.0,
+        "sugar": 10.0,
+        "sodium": 30.0,
+        "fiber": 0.5
+    }
     
-    db_session.add(ingredient)
+    db_session.add_all([Ingredient(**ingredient_fields), NutritionInfo(**nutrition_fields)])
     db_session.commit()
     
     retrieved_ingredient = db_session.query(Ingredient).filter(Ingredient.name == "Salt").first()
-    
-    assert retrieved_ingredient is not None
-    assert retrieved_ingredient.name == "Salt"
-    assert retrieved_ingredient.amount == 1.0
-    assert retrieved_ingredient.unit == "tsp"
-    
-    # Test to_dict method
-    ingredient_dict = retrieved_ingredient.to_dict()
-    assert ingredient_dict['id'] == retrieved_ingredient.id
-    assert ingredient_dict['name'] == "Salt"
-    assert ingredient_dict['amount'] == 1.0
-    assert ingredient_dict['unit'] == "tsp"
-
-
-def test_nutrition_info_model(db_session):
-    """Test NutritionInfo model."""
-    nutrition = NutritionInfo(
-        calories=150.0,
-        protein=3.0,
-        carbs=20.0,
-        fat=7.0,
-        sugar=10.0,
-        sodium=30.0,
-        fiber=0.5
-    )
-    
-    db_session.add(nutrition)
-    db_session.commit()
-    
     retrieved_nutrition = db_session.query(NutritionInfo).filter(NutritionInfo.calories == 150.0).first()
     
-    assert retrieved_nutrition is not None
-    assert retrieved_nutrition.calories == 150.0
-    assert retrieved_nutrition.protein == 3.0
-    assert retrieved_nutrition.carbs == 20.0
-    assert retrieved_nutrition.fat == 7.0
-    assert retrieved_nutrition.sugar == 10.0
-    assert retrieved_nutrition.sodium == 30.0
-    assert retrieved_nutrition.fiber == 0.5
-    
-    # Test to_dict method
-    nutrition_dict = retrieved_nutrition.to_dict()
-    assert nutrition_dict['id'] == retrieved_nutrition.id
-    assert nutrition_dict['calories'] == 150.0
-    assert nutrition_dict['protein'] == 3.0
-    assert nutrition_dict['carbs'] == 20.0
-    assert nutrition_dict['fat'] == 7.0
-    assert nutrition_dict['sugar'] == 10.0
-    assert nutrition_dict['sodium'] == 30.0
-    assert nutrition_dict['fiber'] == 0.5
+    for retrieved, expected in ((retrieved_ingredient, ingredient_fields), (retrieved_nutrition, nutrition_fields)):
+        assert retrieved is not None
+        
+        # Test the mapped attributes and the to_dict method field by field
+        record_dict = retrieved.to_dict()
+        assert record_dict['id'] == retrieved.id
+        for field, value in expected.items():
+            assert getattr(retrieved, field) == value
+            assert record_dict[field] == value
 
 
 def test_meal_plan_model(db_session, sample_recipe):
@@ -184,8 +154,8 @@ def test_meal_plan_model(db_session, sample_recipe):
     # Create meal plan
     meal_plan = MealPlan(
         name="Weekly Plan",
-        start_date=datetime.strptime("2023-01-01", "%Y-%m-%d"),
-        end_date=datetime.strptime("2023-01-07", "%Y-%m-%d"),
+        start_date=date.fromisoformat("2023-01-01"),
+        end_date=date.fromisoformat("2023-01-07"),
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow()
     )
@@ -193,15 +163,13 @@ def test_meal_plan_model(db_session, sample_recipe):
     db_session.add(meal_plan)
     db_session.commit()
     
-    # Add recipes to meal plan via association table
-    from sqlalchemy import text
+    # Add recipes to meal plan via association table in one executemany
     db_session.execute(
-        text("INSERT INTO meal_plan_recipe (meal_plan_id, recipe_id, day, meal_type) VALUES (:meal_plan_id, :recipe_id, :day, :meal_type)"),
-        {"meal_plan_id": meal_plan.id, "recipe_id": sample_recipe.id, "day": "Monday", "meal_type": "Dinner"}
-    )
-    db_session.execute(
-        text("INSERT INTO meal_plan_recipe (meal_plan_id, recipe_id, day, meal_type) VALUES (:meal_plan_id, :recipe_id, :day, :meal_type)"),
-        {"meal_plan_id": meal_plan.id, "recipe_id": recipe2.id, "day": "Tuesday", "meal_type": "Lunch"}
+        meal_plan_recipe.insert(),
+        [
+            {"meal_plan_id": meal_plan.id, "recipe_id": sample_recipe.id, "day": "Monday", "meal_type": "Dinner"},
+            {"meal_plan_id": meal_plan.id, "recipe_id": recipe2.id, "day": "Tuesday", "meal_type": "Lunch"}
+        ]
     )
     
     db_session.commit()
@@ -229,3 +197,124 @@ def test_meal_plan_model(db_session, sample_recipe):
     assert meal_plan_dict['start_date'].startswith("2023-01-01")
     assert meal_plan_dict['end_date'].startswith("2023-01-07")
 
+
+def test_inventory_to_dict_expiration(db_session, monkeypatch):
+    """Test days until expiration on serialised inventory items."""
+    from datetime import timedelta
+    import database
+    from database import Inventory, InventoryItem
+    
+    inventory = Inventory(name="Test Pantry")
+    inventory.items = [
+        InventoryItem(ingredient=Ingredient(name="Milk"), expiration_date=date.today() + timedelta(days=3)),
+        InventoryItem(ingredient=Ingredient(name="Rice")),
+        InventoryItem(ingredient=Ingredient(name="Eggs"), expiration_date=date.today() + timedelta(days=5)),
+    ]
+    db_session.add(inventory)
+    db_session.commit()
+    
+    items = {item['ingredient_name']: item for item in inventory.to_dict()['items']}
+    assert items["Milk"]['days_until_expiration'] == 3
+    assert items["Rice"]['days_until_expiration'] is None
+    assert items["Eggs"]['days_until_expiration'] == 5
+    
+    # An explicit reference date is used as given
+    milk = inventory.items[0]
+    assert milk.to_dict(today=date.today() + timedelta(days=1))['days_until_expiration'] == 2
+    
+    # Serialising the inventory resolves today's date once for all items
+    calls = []
+    
+    class CountingDate(date):
+        @classmethod
+        def today(cls):
+            calls.append(None)
+            return date.today()
+    
+    monkeypatch.setattr(database, 'date_cls', CountingDate)
+    assert len(inventory.to_dict()['items']) == 3
+    assert len(calls) == 1
+
+
+def test_shopping_list_to_dict(db_session):
+    """Test serialising a shopping list with its items."""
+    from database import ShoppingList, ShoppingListItem
+    
+    shopping_list = ShoppingList(name="Weekly Shop")
+    shopping_list.items = [
+        ShoppingListItem(ingredient=Ingredient(name="Milk"), quantity=2.0, unit="cups"),
+        ShoppingListItem(ingredient=Ingredient(name="Rice"), quantity=1.0, unit="kg"),
+    ]
+    db_session.add(shopping_list)
+    db_session.commit()
+    
+    shopping_list_dict = shopping_list.to_dict()
+    assert shopping_list_dict['name'] == "Weekly Shop"
+    items = {item['ingredient_name']: item for item in shopping_list_dict['items']}
+    assert items["Milk"]['quantity'] == 2.0
+    assert items["Milk"]['shopping_list_id'] == shopping_list.id
+    assert items["Rice"]['unit'] == "kg"
+
+
+def test_migrate_json_to_db(tmp_path, monkeypatch):
+    """Test bulk migration of JSON recipes, skipping duplicates and bad entries."""
+    import json
+    import database
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from migrate_to_database import migrate_json_to_db
+    
+    # Keep the migration's engine from replacing the one tracked for app tests
+    monkeypatch.setattr(database, "_tracked_test_engine", database._tracked_test_engine)
+    # Tiny reads, batches and lookups exercise every chunk boundary
+    monkeypatch.setattr("migrate_to_database.READ_SIZE", 7)
+    monkeypatch.setattr("migrate_to_database.LOOKUP_CHUNK_SIZE", 1)
+    
+    json_path = tmp_path / "recipes.json"
+    json_path.write_text(json.dumps([
+        {
+            "title": "Pancakes",
+            "ingredients": [{"name": "Flour", "amount": 2, "unit": "cups"}, {"name": "Milk"}, {"name": "Flour"}],
+            "nutrition": {"calories": 350, "protein": 8},
+        },
+        {"title": "Bread", "ingredients": [{"name": "Flour"}, {"name": "Yeast"}]},
+        {"title": "Pancakes"},
+        {"description": "No title"},
+    ]))
+    db_url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    
+    assert migrate_json_to_db(str(json_path), db_url, batch_size=2)
+    # Running again should not duplicate anything
+    assert migrate_json_to_db(str(json_path), db_url, batch_size=2)
+    
+    engine = create_engine(db_url)
+    with Session(engine) as session:
+        recipes = {recipe.title: recipe for recipe in session.query(Recipe).all()}
+        pancake_ingredients = sorted(ingredient.name for ingredient in recipes["Pancakes"].ingredients)
+        bread_ingredients = sorted(ingredient.name for ingredient in recipes["Bread"].ingredients)
+        ingredient_count = session.query(Ingredient).count()
+        calories = recipes["Pancakes"].nutrition.calories
+        bread_nutrition = recipes["Bread"].nutrition
+    engine.dispose()
+    
+    assert sorted(recipes) == ["Bread", "Pancakes"]
+    assert pancake_ingredients == ["Flour", "Milk"]
+    assert bread_ingredients == ["Flour", "Yeast"]
+    assert ingredient_count == 3
+    assert calories == 350
+    assert bread_nutrition is None
+
+
+def test_migrate_json_to_db_rejects_bad_batch_size(tmp_path):
+    """Test that batch sizes below one are refused instead of silently writing nothing."""
+    import argparse
+    from migrate_to_database import migrate_json_to_db, _batch_size_arg
+    
+    db_url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    for batch_size in (0, -5):
+        with pytest.raises(ValueError):
+            migrate_json_to_db(str(tmp_path / "recipes.json"), db_url, batch_size=batch_size)
+    
+    assert _batch_size_arg("25") == 25
+    with pytest.raises(argparse.ArgumentTypeError):
+        _batch_size_arg("0")
@@ -5,45 +5,49 @@ from app.services.meal_plan_service import MealPlanService
 from app.services.scraper_service import ScraperService
 from app.services.nutrition_service import NutritionService
 from app.services.pdf_service import PDFService
-from database import Recipe, Ingredient, NutritionInfo, MealPlan
-from sqlalchemy import and_, text
-from unittest.mock import patch, MagicMock
-
-
-def test_recipe_service_get_recipes(db_session, sample_recipe):
+from database import Recipe, Ingredient, NutritionInfo, MealPlan, meal_plan_recipe
+from sqlalchemy import and_, select
+from unittest.mock import patch
+from datetime import date, datetime
+
+
+@pytest.mark.parametrize("filters, expected_count", [
+    (None, 1),
+    # Search filter
+    ({'search': 'test'}, 1),
+    ({'search': 'nonexistent'}, 0),
+    # Ingredient filter
+    ({'ingredient': 'flour'}, 1),
+    ({'ingredient': 'nonexistent'}, 0),
+    # Calorie filter
+    ({'min_calories': 300, 'max_calories': 400}, 1),
+    ({'min_calories': 500}, 0),
+    # Sort
+    ({'sort_by': 'title', 'sort_direction': 'asc'}, 1)
+])
+def test_recipe_service_get_recipes(db_session, sample_recipe, filters, expected_count):
     """Test getting recipes with RecipeService."""
     service = RecipeService(db_session)
     
-    # Get all recipes
-    recipes = service.get_recipes()
-    assert len(recipes) == 1
-    assert recipes[0].title == "Test Recipe"
-    
-    # Test with search filter
-    recipes = service.get_recipes({'search': 'test'})
-    assert len(recipes) == 1
-    
-    recipes = service.get_recipes({'search': 'nonexistent'})
-    assert len(recipes) == 0
-    
-    # Test with ingredient filter
-    recipes = service.get_recipes({'ingredient': 'flour'})
-    assert len(recipes) == 1
-    
-    recipes = service.get_recipes({'ingredient': 'nonexistent'})
-    assert len(recipes) == 0
-    
-    # Test with calorie filter
-    recipes = service.get_recipes({'min_calories': 300, 'max_calories': 400})
-    assert len(recipes) == 1
+    recipes = service.get_recipes(filters)
+    assert len(recipes) == expected_count
+    assert all(recipe.title == "Test Recipe" for recipe in recipes)
+
+
+def test_recipe_service_get_recipes_eager_loads_relationships(db_session, count_queries, sample_recipe):
+    """Test that serialising listed recipes issues no per-recipe queries."""
+    for index in range(3):
+        db_session.add(Recipe(title=f"Extra {index}", ingredients=[Ingredient(name=f"Item {index}")]))
+    db_session.commit()
+    db_session.expire_all()
     
-    recipes = service.get_recipes({'min_calories': 500})
-    assert len(recipes) == 0
+    with count_queries() as statements:
+        recipes = RecipeService(db_session).get_recipes()
+        query_count = len(statements)
+        payload = [recipe.to_dict() for recipe in recipes]
     
-    # Test with sort
-    recipes = service.get_recipes({'sort_by': 'title', 'sort_direction': 'asc'})
-    assert len(recipes) == 1
-    assert recipes[0].title == "Test Recipe"
+    assert len(payload) == 4
+    assert len(statements) == query_count
 
 
 def test_recipe_service_get_recipe_by_id(db_session, sample_recipe):
@@ -56,6 +60,15 @@ def test_recipe_service_get_recipe_by_id(db_session, sample_recipe):
     
     recipe = service.get_recipe_by_id(9999)  # Non-existent ID
     assert recipe is None
+    
+    # Relationships arrive with the recipe instead of loading lazily
+    db_session.expunge_all()
+    recipe = service.get_recipe_by_id(sample_recipe.id)
+    assert {"ingredients", "nutrition", "tags"} <= set(recipe.__dict__)
+    
+    db_session.expunge_all()
+    recipe = service.get_recipe_by_id(sample_recipe.id, load_relationships=False)
+    assert "ingredients" not in recipe.__dict__
 
 
 def test_recipe_service_create_recipe(db_session):
@@ -113,6 +126,11 @@ def test_recipe_service_update_recipe(db_session, sample_recipe):
     assert updated_recipe.ingredients[0].name == "New Ingredient"
     assert updated_recipe.nutrition.calories == 400.0
 
+    
+    # An empty list removes every ingredient
+    cleared_recipe = service.update_recipe(sample_recipe.id, {"ingredients": []})
+    assert cleared_recipe.ingredients == []
+
 
 def test_recipe_service_delete_recipe(db_session, sample_recipe):
     """Test deleting a recipe with RecipeService."""
@@ -130,34 +148,26 @@ def test_recipe_service_delete_recipe(db_session, sample_recipe):
     assert result is False
 
 
-@patch('app.services.recipe_service.PDFService')
-def test_recipe_service_generate_pdf(mock_pdf_service, db_session, sample_recipe):
-    """Test generating a PDF for a recipe with RecipeService."""
-    # Mock the PDF service's generate_recipe_pdf method to return True
-    mock_pdf_instance = MagicMock()
-    mock_pdf_instance.generate_recipe_pdf.return_value = True
-    mock_pdf_service.return_value = mock_pdf_instance
-    
-    service = RecipeService(db_session)
+class _StubPDFService:
+    """Report every PDF as rendered without touching ReportLab."""
     
-    # Create a temp directory for PDFs
-    os.makedirs('static/pdfs', exist_ok=True)
+    def generate_recipe_pdf(self, recipe, output_path=None, buffer=None):
+        return True
+
+
+def test_recipe_service_generate_pdf(db_session, sample_recipe, tmp_path):
+    """Test generating a PDF for a recipe with RecipeService."""
+    service = RecipeService(db_session, pdf_service=_StubPDFService(), pdf_output_dir=str(tmp_path))
     
     pdf_path = service.generate_pdf(sample_recipe.id)
     assert pdf_path is not None
-    assert 'static/pdfs' in pdf_path
+    assert pdf_path.startswith(str(tmp_path))
     assert 'recipe_' in pdf_path
     assert '.pdf' in pdf_path
     
     # Verify that the recipe's pdf_path field was updated
     updated_recipe = db_session.query(Recipe).filter(Recipe.id == sample_recipe.id).first()
     assert updated_recipe.pdf_path == pdf_path
-    
-    # Clean up
-    try:
-        os.remove(pdf_path)
-    except:
-        pass
 
 
 def test_meal_plan_service_get_meal_plans(db_session, sample_meal_plan):
@@ -173,6 +183,25 @@ def test_meal_plan_service_get_meal_plans(db_session, sample_meal_plan):
     assert len(meal_plans) == 1
 
 
+def test_meal_plan_service_get_meal_plans_eager_loads_shopping_lists(db_session, count_queries, sample_meal_plan):
+    """Test that serialising listed meal plans issues no per-plan queries."""
+    from database import ShoppingList
+    
+    for index in range(3):
+        db_session.add(MealPlan(name=f"Plan {index}", shopping_list=ShoppingList(name=f"List {index}")))
+    db_session.commit()
+    db_session.expire_all()
+    
+    with count_queries() as statements:
+        meal_plans = MealPlanService(db_session).get_meal_plans()
+        query_count = len(statements)
+        payload = [meal_plan.to_dict() for meal_plan in meal_plans]
+    
+    assert len(payload) == 4
+    assert sum(item['has_shopping_list'] for item in payload) == 3
+    assert len(statements) == query_count
+
+
 def test_meal_plan_service_get_meal_plan_by_id(db_session, sample_meal_plan):
     """Test getting a meal plan by ID with MealPlanService."""
     service = MealPlanService(db_session)
@@ -234,6 +263,17 @@ def test_meal_plan_service_delete_meal_plan(db_session, sample_meal_plan):
     assert result is False
 
 
+def _meal_slots(session, meal_plan_id, recipe_id):
+    """Return the (day, meal_type) slots a recipe fills in a meal plan."""
+    rows = session.execute(
+        select(meal_plan_recipe.c.day, meal_plan_recipe.c.meal_type).where(
+            meal_plan_recipe.c.meal_plan_id == meal_plan_id,
+            meal_plan_recipe.c.recipe_id == recipe_id
+        )
+    )
+    return {tuple(row) for row in rows}
+
+
 def test_meal_plan_service_add_recipe_to_meal_plan(db_session, sample_meal_plan, sample_recipe):
     """Test adding a recipe to a meal plan with MealPlanService."""
     service = MealPlanService(db_session)
@@ -249,23 +289,16 @@ def test_meal_plan_service_add_recipe_to_meal_plan(db_session, sample_meal_plan,
     assert meal_plan is not None
     
     # Verify the recipe was added to the meal plan
-    result = db_session.execute(
-        text("""
-            SELECT * FROM meal_plan_recipe 
-            WHERE meal_plan_id = :meal_plan_id 
-              AND recipe_id = :recipe_id
-              AND day = :day
-              AND meal_type = :meal_type
-        """),
-        {
-            "meal_plan_id": sample_meal_plan.id,
-            "recipe_id": sample_recipe.id,
-            "day": "Wednesday",
-            "meal_type": "Breakfast"
-        }
-    ).fetchone()
+    slots = _meal_slots(db_session, sample_meal_plan.id, sample_recipe.id)
+    assert ("Wednesday", "Breakfast") in slots
+
+
+def test_meal_plan_service_add_recipe_to_meal_plan_missing_records(db_session, sample_meal_plan, sample_recipe):
+    """Adding a recipe returns None when the meal plan or recipe does not exist."""
+    service = MealPlanService(db_session)
     
-    assert result is not None
+    assert service.add_recipe_to_meal_plan(sample_meal_plan.id, 9999, "Friday", "Dinner") is None
+    assert service.add_recipe_to_meal_plan(9999, sample_recipe.id, "Friday", "Dinner") is None
 
 
 def test_meal_plan_service_remove_recipe_from_meal_plan(db_session, sample_meal_plan, sample_recipe):
@@ -273,23 +306,8 @@ def test_meal_plan_service_remove_recipe_from_meal_plan(db_session, sample_meal_
     service = MealPlanService(db_session)
     
     # First, verify the test recipe is in the meal plan for Monday Dinner
-    result = db_session.execute(
-        text("""
-            SELECT * FROM meal_plan_recipe 
-            WHERE meal_plan_id = :meal_plan_id 
-              AND recipe_id = :recipe_id
-              AND day = :day
-              AND meal_type = :meal_type
-        """),
-        {
-            "meal_plan_id": sample_meal_plan.id,
-            "recipe_id": sample_recipe.id,
-            "day": "Monday",
-            "meal_type": "Dinner"
-        }
-    ).fetchone()
-    
-    assert result is not None
+    slots = _meal_slots(db_session, sample_meal_plan.id, sample_recipe.id)
+    assert ("Monday", "Dinner") in slots
     
     # Remove the recipe from the meal plan
     meal_plan = service.remove_recipe_from_meal_plan(
@@ -302,23 +320,8 @@ def test_meal_plan_service_remove_recipe_from_meal_plan(db_session, sample_meal_
     assert meal_plan is not None
     
     # Verify the recipe was removed
-    result = db_session.execute(
-        text("""
-            SELECT * FROM meal_plan_recipe 
-            WHERE meal_plan_id = :meal_plan_id 
-              AND recipe_id = :recipe_id
-              AND day = :day
-              AND meal_type = :meal_type
-        """),
-        {
-            "meal_plan_id": sample_meal_plan.id,
-            "recipe_id": sample_recipe.id,
-            "day": "Monday",
-            "meal_type": "Dinner"
-        }
-    ).fetchone()
-    
-    assert result is None
+    slots = _meal_slots(db_session, sample_meal_plan.id, sample_recipe.id)
+    assert ("Monday", "Dinner") not in slots
 
 
 def test_meal_plan_service_get_meal_plan_with_recipes(db_session, sample_meal_plan, sample_recipe):
@@ -382,6 +385,40 @@ def test_scraper_service_scrape_recipe(mock_extract, mock_fetch_url, mock_calcul
     assert recipe_data['source_url'] == "https://example.com/recipe"
 
 
+def test_scraper_service_parse_extracted_text_sections():
+    """Test that section headings and timings are detected regardless of case."""
+    text = "\n".join([
+        "Pancakes",
+        "Fluffy weekend pancakes.",
+        "INGREDIENTS",
+        "- 1 cup flour",
+        "- 2 tbsp sugar",
+        "Instructions:",
+        "1. Mix ingredients",
+        "2) Cook on a hot griddle",
+        "prep time: 10 minutes",
+        "Cook Time 15 minutes",
+        "Servings: 4",
+    ])
+    
+    data = ScraperService(nutrition_service=NutritionService())._parse_extracted_text(text, "https://example.com")
+    
+    assert data["description"] == "Fluffy weekend pancakes."
+    assert [ingredient["name"] for ingredient in data["ingredients"]] == ["flour", "sugar"]
+    assert data["instructions"] == "Mix ingredients\nCook on a hot griddle"
+    assert (data["prep_time"], data["cook_time"], data["servings"]) == (10, 15, 4)
+
+
+def test_scraper_service_parse_ingredient():
+    """Test splitting ingredient lines into amount, unit and name."""
+    service = ScraperService(nutrition_service=NutritionService())
+    
+    assert service._parse_ingredient("- 2 cups plain flour") == {"name": "plain flour", "amount": 2.0, "unit": "cups"}
+    assert service._parse_ingredient("3 eggs") == {"name": "eggs", "amount": 3.0, "unit": "eggs"}
+    assert service._parse_ingredient("4") == {"name": "4", "amount": 4.0, "unit": None}
+    assert service._parse_ingredient("• salt to taste") == {"name": "salt to taste", "amount": None, "unit": None}
+
+
 def test_nutrition_service_calculate_nutrition(db_session):
     """Test calculating nutrition information with NutritionService."""
     service = NutritionService()
@@ -409,24 +446,91 @@ def test_nutrition_service_calculate_nutrition(db_session):
     assert all(key in nutrition for key in ["calories", "protein", "carbs", "fat", "sugar", "sodium", "fiber"])
 
 
-def test_pdf_service(sample_recipe):
+def test_nutrition_service_profile_precedence():
+    """Ingredient names matching several profiles use the first table entry."""
+    service = NutritionService()
+    
+    assert service._lookup_profile("unsalted butter") is NutritionService.NUTRITION_DB["butter"]
+    assert service._lookup_profile("whole milk") is NutritionService.NUTRITION_DB["milk"]
+    assert service._lookup_profile("water") == {key: 0.0 for key in NutritionService.DEFAULT_KEYS}
+
+
+def test_pdf_service(sample_recipe, tmp_path):
     """Test generating a PDF with PDFService."""
     service = PDFService()
     
-    # Create a temp directory for PDFs
-    os.makedirs('static/pdfs', exist_ok=True)
-    
     # Generate a test PDF
-    pdf_path = 'static/pdfs/test_recipe.pdf'
+    pdf_path = str(tmp_path / 'test_recipe.pdf')
     result = service.generate_recipe_pdf(sample_recipe, pdf_path)
     assert result is True
     
     # Verify the PDF was created
     assert os.path.exists(pdf_path)
+
+
+def test_pdf_service_renders_to_buffer(sample_recipe):
+    """PDFService can render into an in-memory buffer without touching disk."""
+    import io
+    
+    service = PDFService()
+    buffer = io.BytesIO()
     
-    # Clean up
-    try:
-        os.remove(pdf_path)
-    except:
-        pass
+    result = service.generate_recipe_pdf(sample_recipe, buffer=buffer)
+    assert result is True
+    assert buffer.getvalue().startswith(b"%PDF")
+
 
+def test_pdf_service_paginates_long_recipes(sample_recipe):
+    """Long recipes continue onto further pages instead of running off the first."""
+    import io
+    import re
+    
+    sample_recipe.instructions = "\n".join(f"{step}. Keep stirring" for step in range(1, 121))
+    buffer = io.BytesIO()
+    
+    assert PDFService().generate_recipe_pdf(sample_recipe, buffer=buffer) is True
+    assert len(re.findall(rb"/Type /Page\b(?!s)", buffer.getvalue())) > 1
+
+
+def test_meal_plan_service_parse_date():
+    """Test MealPlanService._parse_date accepts strings, dates and datetimes."""
+    assert MealPlanService._parse_date(None) is None
+    assert MealPlanService._parse_date("") is None
+    assert MealPlanService._parse_date("2024-05-01") == datetime(2024, 5, 1)
+    assert MealPlanService._parse_date(date(2024, 5, 1)) == datetime(2024, 5, 1)
+    
+    moment = datetime(2024, 5, 1, 12, 30)
+    assert MealPlanService._parse_date(moment) is moment
+    
+    with pytest.raises(ValueError):
+        MealPlanService._parse_date("not a date")
+
+
+def test_async_pdf_writer_renders_queued_recipe(tmp_path):
+    """Test that queued PDFs are rendered on the writer thread and recorded."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.services.async_writer import AsyncPDFWriter
+    from database import Base
+    
+    engine = create_engine(f"sqlite:///{tmp_path / 'writer.db'}")
+    Base.metadata.create_all(engine)
+    session_maker = sessionmaker(bind=engine)
+    
+    session = session_maker()
+    recipe = Recipe(title="Queued Recipe", instructions="1. Wait")
+    session.add(recipe)
+    session.commit()
+    
+    writer = AsyncPDFWriter(session_maker)
+    service = RecipeService(session, pdf_output_dir=str(tmp_path))
+    pdf_path = service.queue_pdf(recipe.id, writer)
+    writer.flush()
+    
+    assert os.path.exists(pdf_path)
+    session.expire_all()
+    assert session.get(Recipe, recipe.id).pdf_path == pdf_path
+    
+    assert service.queue_pdf(9999, writer) is None
+    session.close()
+    engine.dispose()
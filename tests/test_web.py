@@ -1,7 +1,7 @@
 """Tests for the user-facing web blueprint."""
 from __future__ import annotations
 
-from database import Inventory, InventoryItem, Recipe
+from database import Ingredient, Inventory, InventoryItem, MealPlan, NutritionInfo, Recipe, ShoppingList, ShoppingListItem
 
 
 def _get_session(app):
@@ -9,6 +9,20 @@ def _get_session(app):
     return session_factory()
 
 
+def test_ingredient_icon_filter():
+    """Icons resolve by exact name first, then by the earliest, longest matching key."""
+
+    from app.web import ingredient_icon_filter
+
+    assert ingredient_icon_filter(None) == "/static/images/ingredients/default.svg"
+    assert ingredient_icon_filter(" Onion ") == "/static/images/ingredients/onion.svg"
+    assert ingredient_icon_filter("chicken thighs with salt") == "/static/images/ingredients/chicken.svg"
+    assert ingredient_icon_filter("salt and pepper chicken") == "/static/images/ingredients/spices.svg"
+    assert ingredient_icon_filter("cracked peppercorns") == "/static/images/ingredients/spices.svg"
+    assert ingredient_icon_filter("toasted walnuts") == "/static/images/ingredients/nuts.svg"
+    assert ingredient_icon_filter("water") == "/static/images/ingredients/default.svg"
+
+
 def test_homepage_renders_successfully(client):
     """The homepage should render without server errors."""
 
@@ -18,6 +32,136 @@ def test_homepage_renders_successfully(client):
     assert b"Welcome to Recipe Planner" in response.data
 
 
+def test_homepage_shows_recent_cards(app, client):
+    """Recipe and shopping list cards should show their summary details."""
+
+    with app.app_context():
+        session = _get_session(app)
+        recipe = Recipe(title="Card Recipe", nutrition=NutritionInfo(calories=321.4, protein=12.0))
+        meal_plan = MealPlan(name="Card Plan")
+        shopping_list = ShoppingList(
+            name="Card List",
+            meal_plan=meal_plan,
+            items=[ShoppingListItem(), ShoppingListItem()],
+        )
+        session.add_all([recipe, shopping_list])
+        session.commit()
+        session.close()
+
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert b"Card Recipe" in response.data
+    assert b"321 cal" in response.data
+    assert b"2 items" in response.data
+    assert b"From plan: Card Plan" in response.data
+
+
+def test_homepage_query_count_is_independent_of_shopping_lists(app, client, count_queries):
+    """Recent shopping list cards must not trigger per-list queries."""
+
+    def add_list(name):
+        with app.app_context():
+            session = _get_session(app)
+            session.add(ShoppingList(name=name, meal_plan=MealPlan(name=f"{name} Plan"), items=[ShoppingListItem()]))
+            session.commit()
+            session.close()
+
+    def homepage_query_count():
+        with count_queries() as statements:
+            assert client.get("/").status_code == 200
+        return len(statements)
+
+    add_list("First")
+    client.get("/")
+    single = homepage_query_count()
+
+    add_list("Second")
+    add_list("Third")
+    assert homepage_query_count() == single
+
+
+def test_homepage_revalidates_from_the_shown_cards(app, client, count_queries):
+    """The homepage ETag follows the cards shown, without whole-table scans."""
+
+    with app.app_context():
+        session = _get_session(app)
+        session.add(ShoppingList(name="Tagged List", items=[ShoppingListItem()]))
+        session.commit()
+        list_id = session.query(ShoppingList.id).scalar()
+        session.close()
+
+    first = client.get("/")
+    etag = first.headers["ETag"]
+
+    with count_queries() as statements:
+        cached = client.get("/", headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304
+    assert not any("count(*)" in statement.lower() for statement in statements)
+
+    # A new item changes a shown card's count, so the page is sent again
+    with app.app_context():
+        session = _get_session(app)
+        session.add(ShoppingListItem(shopping_list_id=list_id))
+        session.commit()
+        session.close()
+
+    refreshed = client.get("/", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert b"2 items" in refreshed.data
+
+
+def test_homepage_loaders_run_concurrently(tmp_path):
+    """Homepage loaders return the same data when run on separate sessions."""
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.web import _load_concurrently, _recent_meal_plans, _recent_recipe_cards, _recent_shopping_lists
+    from database import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'homepage.db'}")
+    Base.metadata.create_all(engine)
+    session_maker = sessionmaker(bind=engine, expire_on_commit=False)
+    with session_maker() as session:
+        session.add_all([Recipe(title="Parallel Recipe"), MealPlan(name="Parallel Plan")])
+        session.commit()
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        recipes, meal_plans, shopping_lists = _load_concurrently(
+            executor, session_maker, (_recent_recipe_cards, _recent_meal_plans, _recent_shopping_lists)
+        )
+    engine.dispose()
+
+    assert [recipe.title for recipe in recipes] == ["Parallel Recipe"]
+    assert [meal_plan.name for meal_plan in meal_plans] == ["Parallel Plan"]
+    assert shopping_lists == []
+
+
+def test_loader_pool_scales_with_request_threads():
+    """The loader pool covers every request thread but never the whole DB pool."""
+
+    from app.web import _loader_pool_size
+
+    config = {"REQUEST_THREADS": 8, "DB_POOL_SIZE": 10, "DB_MAX_OVERFLOW": 20}
+    assert _loader_pool_size(config) == 24
+    assert _loader_pool_size(dict(config, DB_MAX_OVERFLOW=5)) == 15
+    assert _loader_pool_size(dict(config, PAGE_LOADER_WORKERS=6)) == 6
+
+
+def test_compiled_templates_are_reused(app, client):
+    """Rendered pages keep their compiled template on the app for later requests."""
+
+    assert client.get("/").status_code == 200
+    template = app.extensions["compiled_templates"]["index.html"]
+
+    assert client.get("/").status_code == 200
+    assert app.extensions["compiled_templates"]["index.html"] is template
+
+
 def test_recipes_page_renders_successfully(client):
     """The recipes catalogue should render without server errors."""
 
@@ -27,6 +171,61 @@ def test_recipes_page_renders_successfully(client):
     assert b"Recipes" in response.data
 
 
+def test_recipes_page_revalidates_with_etag(app, client):
+    """Unchanged listings answer 304 and new recipes invalidate the ETag."""
+
+    response = client.get("/recipes")
+    etag = response.headers["ETag"].strip('"')
+    assert response.status_code == 200
+
+    cached = client.get("/recipes", headers={"If-None-Match": f'"{etag}"'})
+    assert cached.status_code == 304
+
+    with app.app_context():
+        session = _get_session(app)
+        session.add(Recipe(title="Fresh Recipe"))
+        session.commit()
+        session.close()
+
+    refreshed = client.get("/recipes", headers={"If-None-Match": f'"{etag}"'})
+    assert refreshed.status_code == 200
+    assert b"Fresh Recipe" in refreshed.data
+
+
+def test_template_edits_invalidate_etag_with_auto_reload(app, client, tmp_path, monkeypatch):
+    """With template auto-reload on, editing a template changes the ETag."""
+
+    import os
+    import shutil
+
+    from jinja2 import FileSystemLoader
+    from jinja2.utils import LRUCache
+
+    templates = tmp_path / "templates"
+    shutil.copytree(app.template_folder, templates)
+    monkeypatch.setattr(app, "template_folder", str(templates))
+    monkeypatch.setitem(app.__dict__, "jinja_loader", FileSystemLoader(str(templates)))
+    monkeypatch.setattr(app.jinja_env, "auto_reload", True)
+    # Start from an empty template cache and restore the shared one afterwards
+    monkeypatch.setattr(app.jinja_env, "cache", LRUCache(50))
+
+    response = client.get("/recipes")
+    etag = response.headers["ETag"]
+    assert client.get("/recipes", headers={"If-None-Match": etag}).status_code == 304
+
+    page = templates / "recipes.html"
+    source = page.read_text()
+    closing = source.rindex("{% endblock %}")
+    page.write_text(source[:closing] + "<!-- edited template -->" + source[closing:])
+    edited_at = os.path.getmtime(page) + 10
+    os.utime(page, (edited_at, edited_at))
+
+    refreshed = client.get("/recipes", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert b"edited template" in refreshed.data
+
+
 def test_meal_plans_overview_renders(client):
     """The meal plans overview page should return successfully."""
 
@@ -54,6 +253,49 @@ def test_inventory_overview_renders(client):
     assert b"Pantry Inventory" in response.data
 
 
+def test_overviews_render_populated_summaries(app, client):
+    """Overview counts come from per-row subqueries, so no relationship is loaded.
+
+    The pages receive plain column rows rather than ORM objects, which leaves
+    the templates nothing to lazy-load.
+    """
+
+    from flask import template_rendered
+    from sqlalchemy import Row
+
+    with app.app_context():
+        session = _get_session(app)
+        meal_plan = MealPlan(name="Overview Plan")
+        session.add_all([
+            ShoppingList(name="Overview List", meal_plan=meal_plan, items=[ShoppingListItem(), ShoppingListItem()]),
+            Inventory(name="Overview Pantry", items=[InventoryItem()]),
+        ])
+        session.commit()
+        session.close()
+
+    rendered = []
+
+    def record_rows(sender, template, context, **extra):
+        for key in ("meal_plans", "shopping_lists", "inventories"):
+            rendered.extend(context.get(key, ()))
+
+    with template_rendered.connected_to(record_rows, app):
+        for path, expected in [
+            ("/meal-plans", b"Overview Plan"),
+            ("/shopping-lists", b"Overview List"),
+            ("/inventory", b"Overview Pantry"),
+        ]:
+            response = client.get(path)
+            assert response.status_code == 200
+            assert expected in response.data
+
+    assert len(rendered) == 3
+    assert all(isinstance(row, Row) for row in rendered)
+
+    assert b'<td class="text-center">2</td>' in client.get("/shopping-lists").data
+    assert b"1 items tracked" in client.get("/inventory").data
+
+
 def test_add_recipe_form_renders(client):
     """The add recipe page should be accessible."""
 
@@ -142,6 +384,61 @@ def test_delete_recipe_flow(app, client):
     assert deleted is None
 
 
+def test_streamed_recipes_page_consumes_flash_once(app, client):
+    """Flash messages on a streamed page should not reappear on the next visit."""
+
+    with app.app_context():
+        session = _get_session(app)
+        recipe = Recipe(title="Streamed Disposable")
+        session.add(recipe)
+        session.commit()
+        recipe_id = recipe.id
+        session.close()
+
+    response = client.post(f"/recipes/{recipe_id}/delete", follow_redirects=True)
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert b"Recipe deleted." in response.data
+
+    response = client.get("/recipes")
+
+    assert b"Recipe deleted." not in response.data
+    assert response.headers.get("ETag")
+
+
+def test_streamed_page_keeps_session_until_response_closes(app, client):
+    """Templates can lazy-load while streaming; the session goes on close."""
+
+    from flask import template_rendered
+    from sqlalchemy import inspect
+
+    with app.app_context():
+        session = _get_session(app)
+        session.add(Recipe(title="Lazy Streamed", ingredients=[Ingredient(name="Basil")]))
+        session.commit()
+
+    loaded = []
+
+    def check_recipes(sender, template, context, **extra):
+        for recipe in context["recipes"]:
+            recipe_session = inspect(recipe).session
+            assert recipe_session is not None
+            # Force a lazy load, as a template touching an unloaded attribute would
+            recipe_session.expire(recipe, ["ingredients"])
+            loaded.extend(ingredient.name for ingredient in recipe.ingredients)
+
+    with template_rendered.connected_to(check_recipes, app):
+        response = client.get("/recipes")
+        assert b"Lazy Streamed" in response.data
+
+    assert loaded == ["Basil"]
+    registry = app.extensions["db_session_factory"]
+    assert registry.registry.has()
+    response.close()
+    assert not registry.registry.has()
+
+
 def test_scraper_page_renders(client):
     """The scraper page should render successfully."""
 
@@ -257,3 +554,127 @@ def test_add_inventory_item_flow(app, client):
         session.close()
 
     assert ingredient_name == "Canned Beans"
+
+
+def test_add_to_meal_plan_merges_shopping_list_items(app, client):
+    """Adding a recipe twice should create shopping list items once and then sum them."""
+
+    with app.app_context():
+        session = _get_session(app)
+        recipe = Recipe(
+            title="Shopping Recipe",
+            ingredients=[Ingredient(name="Rice", amount=2, unit="cups"), Ingredient(name="Salt")],
+        )
+        meal_plan = MealPlan(name="Shopping Plan")
+        session.add_all([recipe, meal_plan])
+        session.commit()
+        recipe_id, meal_plan_id = recipe.id, meal_plan.id
+        session.close()
+
+    for day in ("Monday", "Tuesday"):
+        response = client.post(
+            f"/recipes/{recipe_id}/add-to-meal-plan",
+            data={"meal_plan_id": str(meal_plan_id), "day": day, "meal_type": "dinner", "create_shopping_list": "on"},
+            follow_redirects=False,
+        )
+        assert response.status_code == 302
+
+    with app.app_context():
+        session = _get_session(app)
+        shopping_list = session.query(ShoppingList).filter_by(meal_plan_id=meal_plan_id).one()
+        items = {item.ingredient.name: (item.quantity, item.unit, item.checked) for item in shopping_list.items}
+        session.close()
+
+    assert items == {"Rice": (4, "cups", False), "Salt": (None, None, False)}
+
+
+def test_recipe_pdf_uses_accel_redirect_when_configured(app, client, tmp_path):
+    """With an accel prefix configured, nginx should be asked to send the PDF."""
+
+    pdf_file = tmp_path / "recipe_test.pdf"
+    pdf_file.write_bytes(b"%PDF-1.4")
+    app.config["PDF_ACCEL_REDIRECT_PREFIX"] = "/protected_pdfs/"
+
+    with app.app_context():
+        session = _get_session(app)
+        recipe = Recipe(title="Accel Recipe", pdf_path=str(pdf_file))
+        session.add(recipe)
+        session.commit()
+        recipe_id = recipe.id
+        session.close()
+
+    response = client.get(f"/recipes/{recipe_id}/pdf")
+
+    assert response.status_code == 200
+    assert response.headers["X-Accel-Redirect"] == "/protected_pdfs/recipe_test.pdf"
+    assert response.headers["Content-Disposition"] == "attachment; filename=recipe_test.pdf"
+    assert response.data == b""
+
+
+def test_recipe_pdf_revalidates_unchanged_file(app, client, tmp_path):
+    """Repeat downloads of an unchanged PDF should be answered with a 304."""
+
+    pdf_file = tmp_path / "recipe_cached.pdf"
+    pdf_file.write_bytes(b"%PDF-1.4")
+
+    with app.app_context():
+        session = _get_session(app)
+        recipe = Recipe(title="Cached PDF Recipe", pdf_path=str(pdf_file))
+        session.add(recipe)
+        session.commit()
+        recipe_id = recipe.id
+        session.close()
+
+    first = client.get(f"/recipes/{recipe_id}/pdf")
+    etag = first.headers["ETag"]
+
+    assert first.status_code == 200
+    assert first.headers["Last-Modified"]
+
+    repeat = client.get(f"/recipes/{recipe_id}/pdf", headers={"If-None-Match": etag})
+
+    assert repeat.status_code == 304
+    assert repeat.data == b""
+
+
+def test_recipe_pdf_regenerates_missing_file(app, client, tmp_path):
+    """A stored PDF path whose file is gone should trigger a fresh render."""
+
+    with app.app_context():
+        session = _get_session(app)
+        recipe = Recipe(title="Regenerated PDF Recipe", pdf_path=str(tmp_path / "missing.pdf"))
+        session.add(recipe)
+        session.commit()
+        recipe_id = recipe.id
+        session.close()
+        app.extensions["recipe_service"].pdf_output_dir = str(tmp_path)
+
+    response = client.get(f"/recipes/{recipe_id}/pdf")
+
+    assert response.status_code == 200
+    assert response.data.startswith(b"%PDF")
+    assert [path.name for path in tmp_path.glob("recipe_*.pdf")]
+
+
+def test_query_count_warning_logs_busy_requests(app, client, caplog):
+    """Requests issuing more statements than the threshold should be logged."""
+
+    app.config["QUERY_COUNT_WARNING"] = 1
+
+    with caplog.at_level("WARNING", logger="app"):
+        assert client.get("/recipes").status_code == 200
+
+    assert any("GET /recipes issued" in record.getMessage() for record in caplog.records)
+
+
+def test_tojson_honours_indent_and_sort_keys(app):
+    """Test that template ``tojson`` keyword arguments reach the orjson provider."""
+    from flask import render_template_string
+
+    with app.app_context():
+        indented = render_template_string("{{ data|tojson(indent=2) }}", data={"b": 1, "a": [1]})
+        # Jinja's default dumps policy also asks for sorted keys
+        assert indented == '{\n  "a": [\n    1\n  ],\n  "b": 1\n}'
+        assert app.json.dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+        # Options orjson cannot express fall back to the stdlib encoder
+        assert app.json.dumps({"a": 1}, indent=4) == '{\n    "a": 1\n}'
@@ -7,3 +7,4 @@ from app import create_app
 
 config_name = os.getenv("FLASK_CONFIG")
 app = create_app(config_name)
+application = app